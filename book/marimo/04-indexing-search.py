@@ -237,7 +237,7 @@ def _(User):
         "Name": user_registered.name,
         "Module": user_registered.module,
         "Path": user_registered.cls_path,
-        "Tags": [str(t) for t in user_registered.tags],
+        "Tags": list(user_registered.tag_names),
         "Instructions": user_registered.instructions,
         "Docstring": user_registered.docstring,
         "Is Abstract": user_registered.is_abstract,
@@ -266,21 +266,20 @@ def _(mo):
 
 @app.cell
 def _(mo, user_registered):
-    method_data = []
-    for name, info in user_registered.methods.items():
-        method_data.append(
-            {
-                "Method": name,
-                "Signature": info["signature"] or "(property)",
-                "Classmethod": "✅" if info["is_classmethod"] else "",
-                "Staticmethod": "✅" if info["is_staticmethod"] else "",
-                "Docstring": (
-                    info["docstring"][:60] + "..."
-                    if len(info["docstring"]) > 60
-                    else info["docstring"]
-                ),
-            }
-        )
+    # Build the table column by column rather than one dict per row
+    methods = user_registered.methods
+    method_docs = [info["docstring"] for info in methods.values()]
+    method_data = {
+        "Method": list(methods),
+        "Signature": [info["signature"] or "(property)" for info in methods.values()],
+        "Classmethod": [
+            "✅" if info["is_classmethod"] else "" for info in methods.values()
+        ],
+        "Staticmethod": [
+            "✅" if info["is_staticmethod"] else "" for info in methods.values()
+        ],
+        "Docstring": [d if len(d) <= 60 else d[:60] + "..." for d in method_docs],
+    }
 
     mo.ui.table(method_data, label="Public Methods")
     return
@@ -298,16 +297,17 @@ def _(mo):
 
 @app.cell
 def _(mo, user_registered):
-    prop_data = []
-    for name, info in user_registered.properties.items():
-        prop_data.append(
-            {
-                "Property": name,
-                "Has Setter": "✅" if info["has_setter"] else "❌",
-                "Has Deleter": "✅" if info["has_deleter"] else "❌",
-                "Docstring": info["docstring"],
-            }
-        )
+    properties = user_registered.properties
+    prop_data = {
+        "Property": list(properties),
+        "Has Setter": [
+            "✅" if info["has_setter"] else "❌" for info in properties.values()
+        ],
+        "Has Deleter": [
+            "✅" if info["has_deleter"] else "❌" for info in properties.values()
+        ],
+        "Docstring": [info["docstring"] for info in properties.values()],
+    }
 
     mo.ui.table(prop_data, label="Properties")
     return
@@ -354,18 +354,13 @@ def _(mo, user_results):
 
 @app.cell
 def _(mo, user_results):
-    query_data = []
-    for r in user_results:
-        query_data.append(
-            {
-                "Name": r.name,
-                "Module": r.module,
-                "Tags": ", ".join(str(t) for t in r.tags),
-                "Docstring": (
-                    r.docstring[:50] + "..." if len(r.docstring) > 50 else r.docstring
-                ),
-            }
-        )
+    query_docs = [r.docstring for r in user_results]
+    query_data = {
+        "Name": [r.name for r in user_results],
+        "Module": [r.module for r in user_results],
+        "Tags": [", ".join(r.tag_names) for r in user_results],
+        "Docstring": [d if len(d) <= 50 else d[:50] + "..." for d in query_docs],
+    }
 
     mo.ui.table(query_data)
     return
@@ -472,6 +467,7 @@ def _(search_registry):
         if not results:
             return f"No types found matching '{query}'"
 
+        # Every line is collected first and joined once at the end
         context = [f"# Codebase Context for: {query}\n"]
 
         for r in results:
@@ -5,7 +5,16 @@ This module contains various types that showcase different features
 of the ontonaut indexing system.
 """
 
-from ontonaut import IndexTag, register_type
+import secrets
+from collections.abc import Callable
+from functools import lru_cache
+
+from ontonaut import IndexTag, get_registry, register_type
+
+# Free email providers; addresses elsewhere are treated as corporate
+_COMMON_PROVIDERS: frozenset[str] = frozenset(
+    {"gmail.com", "yahoo.com", "hotmail.com", "outlook.com"}
+)
 
 
 class ProjectTags(IndexTag):
@@ -41,7 +50,7 @@ class User:
         self.email = email
         self._password_hash = password_hash
         self._is_active = True
-        self._roles = []
+        self._roles: set[str] = set()
 
     def authenticate(self, password: str) -> bool:
         """
@@ -63,8 +72,7 @@ class User:
         Args:
             role: Role name to add
         """
-        if role not in self._roles:
-            self._roles.append(role)
+        self._roles.add(role)
 
     def has_role(self, role: str) -> bool:
         """
@@ -90,8 +98,8 @@ class User:
 
     @property
     def roles(self) -> list[str]:
-        """Get list of user roles."""
-        return self._roles.copy()
+        """Get list of user roles, sorted by name."""
+        return sorted(self._roles)
 
     @classmethod
     def create_admin(cls, username: str, email: str) -> "User":
@@ -201,10 +209,12 @@ class EmailValidator:
     Utility class for email validation and processing.
 
     Provides static methods for email validation, normalization,
-    and domain extraction.
+    and domain extraction. Results are cached per address, since bulk
+    imports see the same addresses and domains over and over.
     """
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def is_valid(email: str) -> bool:
         """
         Check if email address is valid.
@@ -221,9 +231,11 @@ class EmailValidator:
             >>> EmailValidator.is_valid("invalid")
             False
         """
-        return "@" in email and "." in email.split("@")[1]
+        _, at, domain = email.rpartition("@")
+        return bool(at) and "." in domain
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def normalize(email: str) -> str:
         """
         Normalize email to lowercase and trim whitespace.
@@ -237,6 +249,7 @@ class EmailValidator:
         return email.lower().strip()
 
     @staticmethod
+    @lru_cache(maxsize=4096)
     def get_domain(email: str) -> str:
         """
         Extract domain from email address.
@@ -251,7 +264,8 @@ class EmailValidator:
             >>> EmailValidator.get_domain("user@example.com")
             'example.com'
         """
-        return email.split("@")[1] if "@" in email else ""
+        _, at, domain = email.rpartition("@")
+        return domain if at else ""
 
     @staticmethod
     def is_corporate_email(email: str) -> bool:
@@ -264,9 +278,14 @@ class EmailValidator:
         Returns:
             True if email is from corporate domain (not common providers)
         """
-        common_providers = {"gmail.com", "yahoo.com", "hotmail.com", "outlook.com"}
-        domain = EmailValidator.get_domain(email).lower()
-        return domain not in common_providers
+        return EmailValidator.get_domain(email).lower() not in _COMMON_PROVIDERS
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Clear the cached validation results."""
+        cls.is_valid.cache_clear()
+        cls.normalize.cache_clear()
+        cls.get_domain.cache_clear()
 
 
 class Session:
@@ -276,21 +295,32 @@ class Session:
     Each session has a unique token and tracks user activity.
     """
 
-    def __init__(self, user_id: int, token: str):
+    def __init__(
+        self,
+        user_id: int,
+        token: str,
+        on_invalidate: Callable[[], None] | None = None,
+    ):
         """
         Initialize session.
 
         Args:
             user_id: Associated user ID
             token: Session token
+            on_invalidate: Called once when the session is invalidated
         """
         self.user_id = user_id
         self.token = token
         self._is_valid = True
+        self._on_invalidate = on_invalidate
 
     def invalidate(self) -> None:
         """Mark session as invalid (logout)."""
+        if not self._is_valid:
+            return
         self._is_valid = False
+        if self._on_invalidate is not None:
+            self._on_invalidate()
 
     @property
     def is_valid(self) -> bool:
@@ -337,6 +367,7 @@ class AuthenticationService:
         """
         self.user_service = user_service
         self._sessions = {}
+        self._active_count = 0
 
     def login(self, username: str, password: str) -> dict:
         """
@@ -353,7 +384,16 @@ class AuthenticationService:
             ValueError: If authentication fails
         """
         # Simplified implementation
-        return {"token": "abc123", "user_id": 1, "username": username}
+        token = secrets.token_hex(16)
+        self._sessions[token] = Session(
+            user_id=1, token=token, on_invalidate=self._session_ended
+        )
+        self._active_count += 1
+        return {"token": token, "user_id": 1, "username": username}
+
+    def _session_ended(self) -> None:
+        """Update the active session count when a session is invalidated."""
+        self._active_count -= 1
 
     def logout(self, token: str) -> bool:
         """
@@ -385,42 +425,45 @@ class AuthenticationService:
     @property
     def active_sessions(self) -> int:
         """Get count of active sessions."""
-        return sum(1 for s in self._sessions.values() if s.is_valid)
-
-
-# Register all types explicitly
-register_type(
-    typ=User,
-    tags=[ProjectTags.DATABASE, ProjectTags.MODEL, ProjectTags.AUTH],
-    instructions="Primary user model for authentication and authorization",
-)
-
-register_type(
-    typ=UserService,
-    tags=[ProjectTags.API, ProjectTags.SERVICE, ProjectTags.AUTH],
-    instructions="REST API service for user management operations",
-)
-
-register_type(
-    typ=EmailValidator,
-    tags=[ProjectTags.UTIL],
-    instructions="Utilities for email validation and normalization",
-)
-
-register_type(
-    typ=Session,
-    tags=[ProjectTags.DATABASE, ProjectTags.MODEL],
-    instructions="Database session model for tracking user sessions",
-)
-
-register_type(
-    typ=OldEmailChecker,
-    tags=[ProjectTags.DEPRECATED],
-    instructions="DEPRECATED: Use EmailValidator instead. Will be removed in v2.0",
-)
-
-register_type(
-    typ=AuthenticationService,
-    tags=[ProjectTags.API, ProjectTags.SERVICE, ProjectTags.AUTH],
-    instructions="Authentication service handling login, logout, and session management",
-)
+        return self._active_count
+
+
+# Register all types explicitly. Registration only records each type's path
+# and docstring (members are introspected on first use), and the batch updates
+# the search index once for the whole module instead of once per type.
+with get_registry().batch():
+    register_type(
+        typ=User,
+        tags=[ProjectTags.DATABASE, ProjectTags.MODEL, ProjectTags.AUTH],
+        instructions="Primary user model for authentication and authorization",
+    )
+
+    register_type(
+        typ=UserService,
+        tags=[ProjectTags.API, ProjectTags.SERVICE, ProjectTags.AUTH],
+        instructions="REST API service for user management operations",
+    )
+
+    register_type(
+        typ=EmailValidator,
+        tags=[ProjectTags.UTIL],
+        instructions="Utilities for email validation and normalization",
+    )
+
+    register_type(
+        typ=Session,
+        tags=[ProjectTags.DATABASE, ProjectTags.MODEL],
+        instructions="Database session model for tracking user sessions",
+    )
+
+    register_type(
+        typ=OldEmailChecker,
+        tags=[ProjectTags.DEPRECATED],
+        instructions="DEPRECATED: Use EmailValidator instead. Will be removed in v2.0",
+    )
+
+    register_type(
+        typ=AuthenticationService,
+        tags=[ProjectTags.API, ProjectTags.SERVICE, ProjectTags.AUTH],
+        instructions="Authentication service handling login, logout, and session management",
+    )
@@ -23,6 +23,8 @@ from ontonaut.handlers import (
 # Indexing / Search
 from ontonaut.indexing import (
     IndexTag,
+    MethodInfo,
+    PropertyInfo,
     RegisteredType,
     clear_registry,
     get_registry,
@@ -52,6 +54,8 @@ __all__ = [
     "index_type",
     "IndexTag",
     "RegisteredType",
+    "MethodInfo",
+    "PropertyInfo",
     "get_registry",
     "clear_registry",
     "search_registry",
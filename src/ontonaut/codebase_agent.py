@@ -5,13 +5,398 @@ An AI-powered agent that searches your indexed codebase and answers questions
 with relevant code snippets and explanations.
 """
 
-from collections.abc import Iterator
-from typing import Any
+import functools
+import heapq
+import itertools
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from operator import itemgetter
+from typing import Any, Callable
 
 import anywidget
 import traitlets
 
-from ontonaut.indexing import RegisteredType
+from ontonaut.indexing import RegisteredType, get_registry
+from ontonaut.indexing.registry import TypeRegistry
+from ontonaut.indexing.words import WordIndex, tokenize
+
+# Words of a query, used when keywords are not extracted by the AI client
+_TOKEN_RE = re.compile(r"\w+")
+
+# Markdown rendered in responses, compiled once rather than per streamed chunk
+_MD_CODE_BLOCK_RE = re.compile(r"```(\w+)?\n(.*?)```", re.DOTALL)
+_MD_INLINE_CODE_RE = re.compile(r"`([^`]+)`")
+_MD_HEADER_RE = re.compile(r"^(#{1,3}) (.+)$", re.MULTILINE)
+
+# Common question words skipped when extracting keywords without the AI client
+_STOP_WORDS = frozenset(
+    {
+        "how",
+        "do",
+        "i",
+        "can",
+        "you",
+        "what",
+        "where",
+        "when",
+        "why",
+        "is",
+        "are",
+        "the",
+        "a",
+        "an",
+        "to",
+        "for",
+        "of",
+        "in",
+        "on",
+        "with",
+        "this",
+        "that",
+        "please",
+        "show",
+        "me",
+        "find",
+        "get",
+        "use",
+        "using",
+        "does",
+        "has",
+        "have",
+    }
+)
+
+# Maximum number of answered questions kept per agent
+_RESPONSE_CACHE_SIZE = 128
+
+# Maximum number of questions whose AI-extracted keywords are kept per agent
+_KEYWORD_CACHE_SIZE = 256
+
+# Minimum seconds between response updates sent while streaming
+_RESPONSE_FLUSH_INTERVAL = 0.05
+
+# Shapes of AI client, detected once when the client is set
+_OPENAI_CLIENT = "openai"
+_CALLABLE_CLIENT = "callable"
+
+# Points a keyword earns for occurring in each kind of RegisteredType field
+_FIELD_POINTS = {
+    "name": 50,
+    "method": 40,
+    "property": 35,
+    "instructions": 30,
+    "module": 25,
+    "docstring": 20,
+    "method_doc": 15,
+    "property_doc": 10,
+    "tag": 10,
+}
+
+# Number of types returned as context for a question
+_TOP_TYPES = 10
+
+# Maximum number of keyword sets whose top types are kept per scoring index
+_TOP_CACHE_SIZE = 256
+
+
+def _weighted_fields(typ: RegisteredType) -> Iterator[tuple[str, int]]:
+    """
+    Yield each lowercased field of a type with the points a keyword match earns.
+
+    The type name is worth 50 points for a partial match; an exact name match
+    earns a further 50, which is handled by the callers.
+    """
+    for kind, text in typ.lowercase_fields:
+        yield text, _FIELD_POINTS[kind]
+
+
+def _header_html(match: re.Match[str]) -> str:
+    """Render a markdown header matched by _MD_HEADER_RE."""
+    level = len(match.group(1))
+    return f"<h{level}>{match.group(2)}</h{level}>"
+
+
+def _detect_client_kind(client: Any) -> str | None:
+    """
+    Work out how to call an AI client.
+
+    Args:
+        client: AI client instance
+
+    Returns:
+        _OPENAI_CLIENT, _CALLABLE_CLIENT, or None if the client is unsupported
+    """
+    if hasattr(client, "chat") and hasattr(client.chat, "completions"):
+        return _OPENAI_CLIENT
+    if callable(client):
+        return _CALLABLE_CLIENT
+    return None
+
+
+def _fallback_keywords(query: str) -> list[str]:
+    """
+    Extract keywords from a query without the AI client.
+
+    Args:
+        query: Natural language query
+
+    Returns:
+        Words of at least three characters that are not stop words
+    """
+    return [
+        k
+        for k in _TOKEN_RE.findall(query.lower())
+        if len(k) >= 3 and k not in _STOP_WORDS
+    ]
+
+
+@functools.lru_cache(maxsize=2048)
+def _context_item_html(
+    name: str, cls_path: str, docstring: str, tag_names: tuple[str, ...]
+) -> str:
+    """
+    Render one type of the context panel, reusing earlier renders.
+
+    Args:
+        name: Type name
+        cls_path: Fully qualified type path
+        docstring: Type docstring, truncated to 200 characters for display
+        tag_names: Tag values of the type
+
+    Returns:
+        HTML string
+    """
+    tags_html = "".join(
+        f'<span class="agent-context-tag">{tag}</span>' for tag in tag_names
+    )
+    doc_preview = docstring if len(docstring) <= 200 else f"{docstring[:200]}..."
+
+    return f"""
+        <div class="agent-context-item">
+            <div class="agent-context-item-name">{name}</div>
+            <div class="agent-context-item-path">{cls_path}</div>
+            <div class="agent-context-item-doc">{doc_preview}</div>
+            <div class="agent-context-item-tags">{tags_html}</div>
+        </div>
+    """
+
+
+class _ScoringIndex:
+    """
+    Inverted index from words to the weighted fields containing them.
+
+    Each field of each type becomes one posting. A keyword made only of word
+    characters can only occur inside a single word of a field, so a word
+    index lookup finds exactly the fields containing it, and scoring a query
+    costs one lookup per keyword instead of a substring test per field.
+
+    The index follows the registry incrementally: when the registry changes,
+    only the types added or replaced since the last sync are indexed and only
+    the removed ones are dropped.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index; call sync() to fill it."""
+        self.types: list[RegisteredType] = []
+        self.version: int | None = None
+        self._words = WordIndex()
+        # Postings by id: field text, owning slot and points
+        self._texts: dict[int, str] = {}
+        self._owners: dict[int, int] = {}
+        self._points: dict[int, int] = {}
+        self._posting_ids = itertools.count()
+        # Each indexed type gets a slot, keyed by the object's identity
+        self._slots: dict[int, int] = {}
+        self._slot_types: dict[int, RegisteredType] = {}
+        self._slot_postings: dict[int, list[int]] = {}
+        self._slot_ids = itertools.count()
+        self._by_name: dict[str, set[int]] = {}
+        # Position of each slot in ``types``, which keeps registration order
+        self._positions: dict[int, int] = {}
+        self._top_cache: dict[tuple[int, tuple[str, ...]], list[int]] = {}
+
+    def sync(self, types: list[RegisteredType], version: int) -> None:
+        """
+        Bring the index up to date with the registered types.
+
+        Args:
+            types: Registered types, in registration order
+            version: Registry version the types were read at
+        """
+        current = {id(typ): typ for typ in types}
+        for key in [key for key in self._slots if key not in current]:
+            self._remove(key)
+        for key, typ in current.items():
+            if key not in self._slots:
+                self._add(key, typ)
+
+        slots = self._slots
+        self.types = types
+        self._positions = {slots[id(typ)]: i for i, typ in enumerate(types)}
+        self.version = version
+        self._top_cache.clear()
+
+    def _add(self, key: int, typ: RegisteredType) -> None:
+        """Index the fields of one type."""
+        slot = self._slots[key] = next(self._slot_ids)
+        self._slot_types[slot] = typ
+        self._by_name.setdefault(typ.name.lower(), set()).add(slot)
+
+        postings = self._slot_postings[slot] = []
+        for text, points in _weighted_fields(typ):
+            if not text:
+                continue
+            posting = next(self._posting_ids)
+            self._words.insert(set(tokenize(text)), posting)
+            self._texts[posting] = text
+            self._owners[posting] = slot
+            self._points[posting] = points
+            postings.append(posting)
+
+    def _remove(self, key: int) -> None:
+        """Drop the fields of a type no longer registered."""
+        slot = self._slots.pop(key)
+        typ = self._slot_types.pop(slot)
+        name = typ.name.lower()
+        self._by_name[name].discard(slot)
+        if not self._by_name[name]:
+            del self._by_name[name]
+
+        for posting in self._slot_postings.pop(slot):
+            text = self._texts.pop(posting)
+            self._words.remove(set(tokenize(text)), posting)
+            del self._owners[posting]
+            del self._points[posting]
+
+    def score(self, keywords: list[str]) -> dict[int, int]:
+        """
+        Score every type matching at least one keyword.
+
+        Args:
+            keywords: Search keywords
+
+        Returns:
+            Dictionary mapping type index to its relevance score, in
+            ascending index order
+        """
+        totals: dict[int, int] = {}
+        owners = self._owners
+        points = self._points
+        for keyword in keywords:
+            keyword_lower = keyword.lower()
+            if not keyword_lower:
+                continue
+
+            if _TOKEN_RE.fullmatch(keyword_lower) is None:
+                # Spans several words, so the fields have to be scanned
+                postings: Iterable[int] = [
+                    posting
+                    for posting, text in self._texts.items()
+                    if keyword_lower in text
+                ]
+            else:
+                postings = self._words.lookup(keyword_lower)
+
+            for posting in postings:
+                slot = owners[posting]
+                totals[slot] = totals.get(slot, 0) + points[posting]
+
+            for slot in self._by_name.get(keyword_lower, ()):
+                totals[slot] = totals.get(slot, 0) + 50
+
+        positions = self._positions
+        return dict(
+            sorted((positions[slot], total) for slot, total in totals.items() if total)
+        )
+
+    def top(self, keywords: list[str], limit: int = _TOP_TYPES) -> list[int]:
+        """
+        Rank the types best matching the keywords.
+
+        Scores add up per keyword, so keywords are compared case-insensitively
+        and in any order: differently worded questions that extract the same
+        keywords reuse the earlier ranking. Remembered rankings are dropped
+        whenever the index is synced with a changed registry.
+
+        Args:
+            keywords: Search keywords
+            limit: Maximum number of types to return
+
+        Returns:
+            Indexes of the highest scoring types, best first, ties in
+            registration order
+        """
+        key = (limit, tuple(sorted(keyword.lower() for keyword in keywords)))
+        cached = self._top_cache.get(key)
+        if cached is None:
+            # Scores are keyed in ascending type order and nlargest is stable
+            scores = self.score(keywords)
+            top = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+            cached = [owner for owner, score in top if score > 0]
+            if len(self._top_cache) >= _TOP_CACHE_SIZE:
+                self._top_cache.clear()
+            self._top_cache[key] = cached
+        return list(cached)
+
+
+class _ErrorChunk(str):
+    """A response chunk reporting a failure rather than part of the answer."""
+
+
+class _IncrementalMarkdown:
+    """
+    Markdown text rendered to HTML as it streams in.
+
+    Complete lines are rendered once and kept; only the unfinished tail is
+    rendered again on each update. Lines are kept only if their HTML has no
+    unpaired backtick left, so no code span or block crosses the cut and the
+    result is the same as rendering the whole text at once.
+    """
+
+    def __init__(self, render: Callable[[str], str]) -> None:
+        """
+        Start an empty document.
+
+        Args:
+            render: Function converting markdown to HTML
+        """
+        self._render = render
+        self._parts: list[str] = []
+        self._html = ""
+        self._tail = ""
+
+    @property
+    def text(self) -> str:
+        """Get all markdown received so far."""
+        return "".join(self._parts)
+
+    def feed(self, chunk: str) -> None:
+        """
+        Append streamed markdown.
+
+        Args:
+            chunk: Next piece of the text
+        """
+        self._parts.append(chunk)
+        self._tail += chunk
+
+    def html(self) -> str:
+        """
+        Render the markdown received so far.
+
+        Returns:
+            HTML string
+        """
+        cut = self._tail.rfind("\n") + 1
+        if cut:
+            head = self._render(self._tail[:cut])
+            if "`" not in head:
+                self._html += head
+                self._tail = self._tail[cut:]
+        return self._html + self._render(self._tail)
 
 
 class CodebaseAgent(anywidget.AnyWidget):
@@ -70,15 +455,15 @@ class CodebaseAgent(anywidget.AnyWidget):
         askButton.textContent = "⏳ Searching...";
 
         model.send({ type: "ask", query: query });
-
-        // Reset button after a delay (will be reset properly when response completes)
-        setTimeout(() => {
-          isProcessing = false;
-          askButton.disabled = false;
-          askButton.textContent = "🔍 Search Codebase";
-        }, 1000);
       };
 
+      // The backend bumps "done" when it has finished answering
+      model.on("change:done", () => {
+        isProcessing = false;
+        askButton.disabled = false;
+        askButton.textContent = "🔍 Search Codebase";
+      });
+
       inputSection.appendChild(input);
       inputSection.appendChild(askButton);
 
@@ -328,6 +713,7 @@ class CodebaseAgent(anywidget.AnyWidget):
     response = traitlets.Unicode("").tag(sync=True)
     error = traitlets.Unicode("").tag(sync=True)
     theme = traitlets.Unicode("light").tag(sync=True)
+    done = traitlets.Int(0).tag(sync=True)
 
     def __init__(
         self,
@@ -348,33 +734,87 @@ class CodebaseAgent(anywidget.AnyWidget):
             **kwargs: Additional widget arguments
         """
         super().__init__(**kwargs)
+
+        # Caches of AI output, created before the client is set since setting
+        # it clears them. Keywords are keyed by query; answers are keyed by
+        # (query, registry version) -> (context HTML, response)
+        self._keyword_cache: OrderedDict[str, tuple[str, ...]] = OrderedDict()
+        self._response_cache: OrderedDict[tuple[str, int], tuple[str, str]] = (
+            OrderedDict()
+        )
+
         self.ai_client = ai_client
         self.query = query
         self.placeholder = placeholder
         self.theme = theme
         self._is_processing = False  # Flag to prevent concurrent processing
 
+        # Frontend questions run on a single worker thread, created on first use
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending_question: Future[None] | None = None
+
+        # Registry searched for context
+        self._registry = get_registry()
+
+        # Keyword index over the registry, synced when the registry changes
+        self._scoring_index: _ScoringIndex | None = None
+
         # Register message handler
         self.on_msg(self._handle_message)
 
+    @property
+    def ai_client(self) -> Any:
+        """Get the AI client used for keyword extraction and answers."""
+        return self._ai_client
+
+    @ai_client.setter
+    def ai_client(self, client: Any) -> None:
+        # Probe the client's shape here rather than on every call
+        self._ai_client = client
+        self._client_kind = _detect_client_kind(client)
+        # Output of the previous client must not be served for this one
+        self._keyword_cache.clear()
+        self._response_cache.clear()
+
     def _handle_message(self, widget, content, buffers):
         """Handle messages from frontend."""
         msg_type = content.get("type")
 
         if msg_type == "ask":
+            query = content.get("query", "")
             # Prevent concurrent processing
-            if self._is_processing:
+            if self._is_processing or not query:
+                # Nothing will be answered, so let the frontend re-enable
+                # its button instead of waiting forever
+                self.done += 1
                 return
 
-            query = content.get("query", "")
-            if query:
-                # Set flag BEFORE processing to prevent race conditions
-                self._is_processing = True
-                try:
-                    self._process_question(query)
-                finally:
-                    # Always clear processing flag
-                    self._is_processing = False
+            # Set flag BEFORE processing to prevent race conditions
+            self._is_processing = True
+
+            # Answer on a worker thread so the handler returns at once
+            # and the widget keeps receiving messages while streaming
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="codebase-agent"
+                )
+            self._pending_question = self._executor.submit(
+                self._answer_in_background, query
+            )
+
+    def _answer_in_background(self, query: str) -> None:
+        """
+        Process a question sent by the frontend.
+
+        Args:
+            query: User question
+        """
+        try:
+            self._process_question(query)
+        finally:
+            # Always clear processing flag, then let the frontend know
+            self._is_processing = False
+            self.done += 1
 
     def _search_codebase(self, query: str) -> list[RegisteredType]:
         """
@@ -389,28 +829,32 @@ class CodebaseAgent(anywidget.AnyWidget):
         Returns:
             List of relevant RegisteredType instances, ranked by relevance
         """
-        from ontonaut.indexing import get_registry
-
         # Use AI to extract keywords
         keywords = self._extract_keywords_with_ai(query)
 
         if not keywords:
             return []
 
-        # Get all registered types
-        registry = get_registry()
-        all_types = registry.get_all()
+        index = self._get_scoring_index(self._registry)
+        return [index.types[i] for i in index.top(keywords)]
+
+    def _get_scoring_index(self, registry: TypeRegistry) -> _ScoringIndex:
+        """
+        Get the keyword index for the registry, syncing it if stale.
 
-        # Score each type based on keyword matches
-        scored_results = []
-        for typ in all_types:
-            score = self._calculate_relevance_score(typ, keywords)
-            if score > 0:
-                scored_results.append((typ, score))
+        Args:
+            registry: Type registry to index
 
-        # Sort by score (highest first) and return top 10
-        scored_results.sort(key=lambda x: x[1], reverse=True)
-        return [typ for typ, score in scored_results[:10]]
+        Returns:
+            Scoring index matching the registry's current version
+        """
+        version = registry.version
+        index = self._scoring_index
+        if index is None:
+            index = self._scoring_index = _ScoringIndex()
+        if index.version != version:
+            index.sync(registry.get_all(), version)
+        return index
 
     def _extract_keywords_with_ai(self, query: str) -> list[str]:
         """
@@ -424,44 +868,14 @@ class CodebaseAgent(anywidget.AnyWidget):
         """
         if not self.ai_client:
             # Fallback to simple extraction if no AI client
-            import re
-
-            STOP_WORDS = {
-                "how",
-                "do",
-                "i",
-                "can",
-                "you",
-                "what",
-                "where",
-                "when",
-                "why",
-                "is",
-                "are",
-                "the",
-                "a",
-                "an",
-                "to",
-                "for",
-                "of",
-                "in",
-                "on",
-                "with",
-                "this",
-                "that",
-                "please",
-                "show",
-                "me",
-                "find",
-                "get",
-                "use",
-                "using",
-                "does",
-                "has",
-                "have",
-            }
-            keywords = re.findall(r"\b\w+\b", query.lower())
-            return [k for k in keywords if len(k) >= 3 and k not in STOP_WORDS]
+            return _fallback_keywords(query)
+
+        # The AI call dominates search latency, so extracted keywords are
+        # remembered per question
+        cached = self._keyword_cache.get(query)
+        if cached is not None:
+            self._keyword_cache.move_to_end(query)
+            return list(cached)
 
         prompt = f"""Extract search keywords from this question for searching a Python codebase.
 Return ONLY a comma-separated list of keywords. Include:
@@ -476,9 +890,7 @@ Keywords:"""
 
         try:
             # Try OpenAI-style client
-            if hasattr(self.ai_client, "chat") and hasattr(
-                self.ai_client.chat, "completions"
-            ):
+            if self._client_kind == _OPENAI_CLIENT:
                 response = self.ai_client.chat.completions.create(
                     model="gpt-4",
                     messages=[{"role": "user", "content": prompt}],
@@ -487,7 +899,7 @@ Keywords:"""
                 )
                 keywords_text = response.choices[0].message.content.strip()
             # Try callable client
-            elif callable(self.ai_client):
+            elif self._client_kind == _CALLABLE_CLIENT:
                 keywords_text = self.ai_client(prompt)
                 if hasattr(keywords_text, "__iter__") and not isinstance(
                     keywords_text, str
@@ -496,56 +908,22 @@ Keywords:"""
                     keywords_text = "".join(keywords_text)
             else:
                 # Fallback
-                import re
-
-                keywords = re.findall(r"\b\w+\b", query.lower())
+                keywords = _TOKEN_RE.findall(query.lower())
                 return [k for k in keywords if len(k) >= 3]
 
             # Parse comma-separated keywords
             keywords = [k.strip().lower() for k in keywords_text.split(",")]
             keywords = [k for k in keywords if k and len(k) >= 2]
-            return keywords[:15]  # Limit to 15 keywords
+            keywords = keywords[:15]  # Limit to 15 keywords
+
+            self._keyword_cache[query] = tuple(keywords)
+            if len(self._keyword_cache) > _KEYWORD_CACHE_SIZE:
+                self._keyword_cache.popitem(last=False)
+            return keywords
 
         except Exception:
             # Fallback to simple extraction on any error
-            import re
-
-            STOP_WORDS = {
-                "how",
-                "do",
-                "i",
-                "can",
-                "you",
-                "what",
-                "where",
-                "when",
-                "why",
-                "is",
-                "are",
-                "the",
-                "a",
-                "an",
-                "to",
-                "for",
-                "of",
-                "in",
-                "on",
-                "with",
-                "this",
-                "that",
-                "please",
-                "show",
-                "me",
-                "find",
-                "get",
-                "use",
-                "using",
-                "does",
-                "has",
-                "have",
-            }
-            keywords = re.findall(r"\b\w+\b", query.lower())
-            return [k for k in keywords if len(k) >= 3 and k not in STOP_WORDS]
+            return _fallback_keywords(query)
 
     def _calculate_relevance_score(
         self, typ: RegisteredType, keywords: list[str]
@@ -570,59 +948,20 @@ Keywords:"""
         Returns:
             Relevance score (higher is better)
         """
-        score = 0
         typ_name_lower = typ.name.lower()
-        docstring_lower = typ.docstring.lower()
-        instructions_lower = typ.instructions.lower()
-        module_lower = typ.module.lower()
+        fields = list(_weighted_fields(typ))
 
+        score = 0
         for keyword in keywords:
             keyword_lower = keyword.lower()
 
-            # Type name matches (highest priority)
+            # Exact type name match tops up the partial match to 100 points
             if typ_name_lower == keyword_lower:
-                score += 100
-            elif keyword_lower in typ_name_lower:
                 score += 50
 
-            # Module matches
-            if keyword_lower in module_lower:
-                score += 25
-
-            # Method name matches
-            for method_name, method_info in typ.methods.items():
-                if keyword_lower in method_name.lower():
-                    score += 40
-                # Method docstring matches
-                if (
-                    method_info.get("docstring")
-                    and keyword_lower in method_info["docstring"].lower()
-                ):
-                    score += 15
-
-            # Property name matches
-            for prop_name, prop_info in typ.properties.items():
-                if keyword_lower in prop_name.lower():
-                    score += 35
-                # Property docstring matches
-                if (
-                    prop_info.get("docstring")
-                    and keyword_lower in prop_info["docstring"].lower()
-                ):
-                    score += 10
-
-            # Instructions match
-            if keyword_lower in instructions_lower:
-                score += 30
-
-            # Docstring match
-            if keyword_lower in docstring_lower:
-                score += 20
-
-            # Tag match
-            for tag in typ.tags:
-                if keyword_lower in str(tag).lower():
-                    score += 10
+            for text, points in fields:
+                if keyword_lower in text:
+                    score += points
 
         return score
 
@@ -639,24 +978,10 @@ Keywords:"""
         if not types:
             return "<p style='color: #6b7280;'>No indexed types found. Register types with @index_type decorator.</p>"
 
-        html_parts = []
-        for t in types:
-            tags_html = "".join(
-                f'<span class="agent-context-tag">{tag}</span>' for tag in t.tags
-            )
-
-            html_parts.append(
-                f"""
-                <div class="agent-context-item">
-                    <div class="agent-context-item-name">{t.name}</div>
-                    <div class="agent-context-item-path">{t.cls_path}</div>
-                    <div class="agent-context-item-doc">{t.docstring[:200]}...</div>
-                    <div class="agent-context-item-tags">{tags_html}</div>
-                </div>
-            """
-            )
-
-        return "".join(html_parts)
+        return "".join(
+            _context_item_html(t.name, t.cls_path, t.docstring, t.tag_names)
+            for t in types
+        )
 
     def _build_context_for_ai(self, types: list[RegisteredType]) -> str:
         """
@@ -671,39 +996,11 @@ Keywords:"""
         if not types:
             return "No relevant code found in the indexed codebase."
 
-        context_parts = [
-            "# Relevant Code from Indexed Codebase\n",
-            "The following types and their methods are relevant to your question:\n\n",
-        ]
-
-        for t in types:
-            context_parts.append(f"## {t.cls_path}\n")
-            context_parts.append(f"**Tags:** {', '.join(str(tag) for tag in t.tags)}\n")
-            context_parts.append(f"**Description:** {t.docstring}\n")
-
-            if t.instructions:
-                context_parts.append(f"**Notes:** {t.instructions}\n")
-
-            context_parts.append("\n### Methods:\n")
-            for method_name, method_info in list(t.methods.items())[
-                :5
-            ]:  # Limit methods
-                sig = method_info["signature"] or "()"
-                context_parts.append(f"- `{method_name}{sig}`")
-                if method_info["docstring"]:
-                    context_parts.append(f": {method_info['docstring'][:100]}")
-                context_parts.append("\n")
-
-            if t.properties:
-                context_parts.append("\n### Properties:\n")
-                for prop_name, prop_info in list(t.properties.items())[:3]:
-                    context_parts.append(
-                        f"- `{prop_name}`: {prop_info['docstring'][:80]}\n"
-                    )
-
-            context_parts.append("\n")
-
-        return "".join(context_parts)
+        header = (
+            "# Relevant Code from Indexed Codebase\n"
+            "The following types and their methods are relevant to your question:\n\n"
+        )
+        return header + "".join(t.context_snippet for t in types)
 
     def _stream_ai_response(self, query: str, context: str) -> Iterator[str]:
         """
@@ -714,10 +1011,13 @@ Keywords:"""
             context: Codebase context
 
         Yields:
-            Response chunks
+            Response chunks; failures are reported as _ErrorChunk, which may
+            follow partial text if the client fails mid-stream
         """
         if self.ai_client is None:
-            yield "❌ No AI client provided. Pass an AI client to CodebaseAgent(ai_client=...)."
+            yield _ErrorChunk(
+                "❌ No AI client provided. Pass an AI client to CodebaseAgent(ai_client=...)."
+            )
             return
 
         system_prompt = f"""You are a helpful AI assistant that answers questions about a Python codebase.
@@ -736,9 +1036,7 @@ Use markdown formatting for code blocks."""
 
         try:
             # Try OpenAI-style client first
-            if hasattr(self.ai_client, "chat") and hasattr(
-                self.ai_client.chat, "completions"
-            ):
+            if self._client_kind == _OPENAI_CLIENT:
                 response = self.ai_client.chat.completions.create(
                     model="gpt-4",
                     messages=[
@@ -754,7 +1052,7 @@ Use markdown formatting for code blocks."""
                         yield chunk.choices[0].delta.content
 
             # Try callable client (custom wrapper)
-            elif callable(self.ai_client):
+            elif self._client_kind == _CALLABLE_CLIENT:
                 result = self.ai_client(query, context=context)
 
                 # Handle generator
@@ -764,10 +1062,12 @@ Use markdown formatting for code blocks."""
                     yield str(result)
 
             else:
-                yield "❌ Unsupported AI client type. Client should have .chat.completions or be callable."
+                yield _ErrorChunk(
+                    "❌ Unsupported AI client type. Client should have .chat.completions or be callable."
+                )
 
         except Exception as e:
-            yield f"❌ Error calling AI client: {str(e)}"
+            yield _ErrorChunk(f"❌ Error calling AI client: {str(e)}")
 
     def _process_question(self, query: str) -> None:
         """
@@ -781,6 +1081,15 @@ Use markdown formatting for code blocks."""
             self.error = ""
             self.response = ""
 
+            # Repeated questions against an unchanged registry reuse the
+            # earlier answer instead of calling the AI client again
+            cache_key = (query, self._registry.version)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                self.context, self.response = cached
+                return
+
             # Search codebase
             relevant_types = self._search_codebase(query)
 
@@ -790,12 +1099,27 @@ Use markdown formatting for code blocks."""
             # Build context for AI
             ai_context = self._build_context_for_ai(relevant_types)
 
-            # Stream AI response
-            response_parts = []
+            # Stream AI response; each trait update re-sends the whole
+            # rendered answer, so updates are throttled while chunks arrive
+            markdown = _IncrementalMarkdown(self._markdown_to_html)
+            last_flush = float("-inf")
+            failed = False
             for chunk in self._stream_ai_response(query, ai_context):
-                response_parts.append(chunk)
-                # Convert markdown to HTML for display
-                self.response = self._markdown_to_html("".join(response_parts))
+                failed = failed or isinstance(chunk, _ErrorChunk)
+                markdown.feed(chunk)
+                now = time.monotonic()
+                if now - last_flush >= _RESPONSE_FLUSH_INTERVAL:
+                    # Convert markdown to HTML for display
+                    self.response = markdown.html()
+                    last_flush = now
+
+            self.response = markdown.html()
+
+            # Answers cut short by a client error must not be replayed
+            if not failed:
+                self._response_cache[cache_key] = (self.context, self.response)
+                if len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                    self._response_cache.popitem(last=False)
 
         except Exception as e:
             self.error = f"Error processing question: {str(e)}"
@@ -810,25 +1134,16 @@ Use markdown formatting for code blocks."""
         Returns:
             HTML string
         """
-        import re
-
-        html = markdown
-
         # Code blocks
-        html = re.sub(
-            r"```(\w+)?\n(.*?)```",
-            r'<pre><code class="language-\1">\2</code></pre>',
-            html,
-            flags=re.DOTALL,
+        html = _MD_CODE_BLOCK_RE.sub(
+            r'<pre><code class="language-\1">\2</code></pre>', markdown
         )
 
         # Inline code
-        html = re.sub(r"`([^`]+)`", r"<code>\1</code>", html)
+        html = _MD_INLINE_CODE_RE.sub(r"<code>\1</code>", html)
 
         # Headers
-        html = re.sub(r"^### (.+)$", r"<h3>\1</h3>", html, flags=re.MULTILINE)
-        html = re.sub(r"^## (.+)$", r"<h2>\1</h2>", html, flags=re.MULTILINE)
-        html = re.sub(r"^# (.+)$", r"<h1>\1</h1>", html, flags=re.MULTILINE)
+        html = _MD_HEADER_RE.sub(_header_html, html)
 
         # Line breaks
         html = html.replace("\n", "<br>")
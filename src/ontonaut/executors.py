@@ -5,6 +5,9 @@ import json
 import re
 from typing import Any, Callable, Optional
 
+# Words of a calculator expression that may name a variable
+_WORD_RE = re.compile(r"\w+")
+
 
 class BaseExecutor:
     """
@@ -191,9 +194,12 @@ class CalculatorExecutor(BaseExecutor):
         Returns:
             Numeric result
         """
-        # Replace variables
-        for var_name, value in self.variables.items():
-            expr = re.sub(r"\b" + var_name + r"\b", str(value), expr)
+        # Replace variables in one pass over the words of the expression
+        variables = self.variables
+        if variables:
+            expr = _WORD_RE.sub(
+                lambda m: str(variables[m[0]]) if m[0] in variables else m[0], expr
+            )
 
         # Safe eval for math
         try:
@@ -127,16 +127,16 @@ class OpenAIHandler(BaseHandler):
                 **self.kwargs,
             )
 
-            full_response = ""
+            response_parts = []
             for chunk in stream:
                 if chunk.choices[0].delta.content:
                     content = chunk.choices[0].delta.content
-                    full_response += content
+                    response_parts.append(content)
                     yield content
 
-            # Add assistant response to history
+            # Add assistant response to history, joined once
             self.conversation_history.append(
-                {"role": "assistant", "content": full_response}
+                {"role": "assistant", "content": "".join(response_parts)}
             )
 
         except Exception as e:
@@ -219,14 +219,14 @@ class AnthropicHandler(BaseHandler):
                 system=self.system_prompt,
                 **self.kwargs,
             ) as stream:
-                full_response = ""
+                response_parts = []
                 for text in stream.text_stream:
-                    full_response += text
+                    response_parts.append(text)
                     yield text
 
-            # Add assistant response to history
+            # Add assistant response to history, joined once
             self.conversation_history.append(
-                {"role": "assistant", "content": full_response}
+                {"role": "assistant", "content": "".join(response_parts)}
             )
 
         except Exception as e:
@@ -5,6 +5,7 @@ A codebase search and indexing system that allows developers to register types
 with metadata for intelligent code navigation and search.
 """
 
+from ontonaut.indexing.metadata import MethodInfo, PropertyInfo
 from ontonaut.indexing.registered_type import RegisteredType
 from ontonaut.indexing.registry import (
     clear_registry,
@@ -22,5 +23,7 @@ __all__ = [
     "clear_registry",
     "search_registry",
     "RegisteredType",
+    "MethodInfo",
+    "PropertyInfo",
     "IndexTag",
 ]
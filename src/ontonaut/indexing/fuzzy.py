@@ -0,0 +1,129 @@
+"""
+Edit-distance matching for misspelled search terms.
+"""
+
+import re
+
+_IDENTIFIER_WORD = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+
+def levenshtein(a: str, b: str) -> int:
+    """
+    Compute the Levenshtein edit distance between two strings.
+
+    Args:
+        a: First string
+        b: Second string
+
+    Returns:
+        Minimum number of insertions, deletions and substitutions
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+def identifier_words(name: str) -> set[str]:
+    """
+    Split an identifier into lowercase words.
+
+    The full lowercased name is included alongside its snake_case and
+    CamelCase parts, e.g. ``"UserService"`` gives
+    ``{"userservice", "user", "service"}``.
+
+    Args:
+        name: Identifier to split
+
+    Returns:
+        Set of lowercase words
+    """
+    words = {word.lower() for word in _IDENTIFIER_WORD.findall(name)}
+    words.add(name.lower())
+    return words
+
+
+class _BKNode:
+    __slots__ = ("term", "ids", "children")
+
+    def __init__(self, term: str, entry_id: int) -> None:
+        self.term = term
+        self.ids = {entry_id}
+        self.children: dict[int, _BKNode] = {}
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over terms for approximate lookups.
+
+    Each child edge is labelled with its edit distance from the parent term,
+    so a search only descends into children whose label lies within
+    ``radius`` of the query's distance to the parent (triangle inequality).
+    """
+
+    def __init__(self) -> None:
+        self._root: _BKNode | None = None
+
+    def add(self, term: str, entry_id: int) -> None:
+        """
+        Add a term belonging to an entry.
+
+        Args:
+            term: Lowercase term
+            entry_id: Integer id of the entry the term belongs to
+        """
+        if self._root is None:
+            self._root = _BKNode(term, entry_id)
+            return
+
+        node = self._root
+        while True:
+            distance = levenshtein(term, node.term)
+            if distance == 0:
+                node.ids.add(entry_id)
+                return
+            child = node.children.get(distance)
+            if child is None:
+                node.children[distance] = _BKNode(term, entry_id)
+                return
+            node = child
+
+    def search(self, term: str, radius: int) -> set[int]:
+        """
+        Find entries with a term within ``radius`` edits of the given term.
+
+        Args:
+            term: Lowercase term to look up
+            radius: Maximum edit distance
+
+        Returns:
+            Set of matching entry ids
+        """
+        matches: set[int] = set()
+        if self._root is None:
+            return matches
+
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = levenshtein(term, node.term)
+            if distance <= radius:
+                matches.update(node.ids)
+            for edge, child in node.children.items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return matches
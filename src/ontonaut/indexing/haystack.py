@@ -0,0 +1,63 @@
+"""
+Columnar text store for scanning many search blobs in one pass.
+"""
+
+from bisect import bisect_right
+
+# Separates entries in the concatenated text; queries containing it cannot be
+# scanned, since a match could then run from one entry into the next
+SEPARATOR = "\x01"
+
+
+class Haystack:
+    """
+    Concatenation of many entries' search text for bulk substring scans.
+
+    Instead of testing ``query in blob`` once per entry from Python, the
+    query is located with repeated ``str.find`` calls over a single string,
+    so the scan runs in C and Python only handles the entries that match.
+    """
+
+    def __init__(self, entries: dict[int, str]) -> None:
+        """
+        Build the haystack.
+
+        Args:
+            entries: Mapping of entry id to lowercase search text
+        """
+        self._ids = list(entries)
+        self._starts: list[int] = []
+
+        offset = 0
+        for text in entries.values():
+            self._starts.append(offset)
+            offset += len(text) + len(SEPARATOR)
+
+        self._text = SEPARATOR.join(entries.values())
+
+    def find_all(self, query: str) -> set[int]:
+        """
+        Find the entries whose text contains the query.
+
+        Args:
+            query: Lowercase substring to look for (must not contain SEPARATOR)
+
+        Returns:
+            Set of matching entry ids
+        """
+        hits: set[int] = set()
+        starts = self._starts
+        pos = self._text.find(query)
+
+        while pos != -1:
+            index = bisect_right(starts, pos) - 1
+            hits.add(self._ids[index])
+            if index + 1 == len(starts):
+                break
+            # Skip the rest of this entry; one hit per entry is enough
+            pos = self._text.find(query, starts[index + 1])
+
+        return hits
+
+    def __len__(self) -> int:
+        return len(self._ids)
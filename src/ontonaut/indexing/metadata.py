@@ -2,8 +2,128 @@
 Type metadata extraction utilities.
 """
 
+import importlib
 import inspect
-from typing import Any
+import sys
+import types
+from collections.abc import Iterator, Mapping
+from typing import Any, Callable
+from weakref import WeakKeyDictionary
+
+# Rendered signatures keyed by the underlying function, shared by every class
+# that inherits it; weak keys let redefined functions be collected. Bound
+# methods (classmethods) omit their first parameter, so they get their own map
+_signature_cache: "WeakKeyDictionary[Callable[..., Any], str]" = WeakKeyDictionary()
+_bound_signature_cache: "WeakKeyDictionary[Callable[..., Any], str]" = (
+    WeakKeyDictionary()
+)
+
+# Extracted metadata per class; weak keys let classes defined at runtime be
+# collected
+_metadata_cache: "WeakKeyDictionary[type, dict[str, Any]]" = WeakKeyDictionary()
+
+# Default for inspect.getattr_static, distinct from any real attribute value
+_MISSING = object()
+
+
+class _MemberInfo(Mapping[str, Any]):
+    """
+    Slotted member metadata that can also be read as a mapping.
+
+    Records are read-only, since cached metadata shares them between every
+    registration of a class.
+    """
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def _asdict(self) -> dict[str, Any]:
+        """Get the fields as a new plain dictionary."""
+        return {name: getattr(self, name) for name in self}
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self)
+        return f"{type(self).__name__}({fields})"
+
+
+class MethodInfo(_MemberInfo):
+    """
+    Metadata about a public method.
+
+    Fields are plain attributes (``info.signature``), and the object can
+    also be read like the dict it replaces (``info["signature"]``).
+    """
+
+    __slots__ = (
+        "docstring",
+        "signature",
+        "is_classmethod",
+        "is_staticmethod",
+        "is_property",
+    )
+
+    docstring: str
+    signature: str | None
+    is_classmethod: bool
+    is_staticmethod: bool
+    is_property: bool
+
+    def __init__(
+        self,
+        docstring: str = "",
+        signature: str | None = "()",
+        is_classmethod: bool = False,
+        is_staticmethod: bool = False,
+        is_property: bool = False,
+    ) -> None:
+        init = object.__setattr__
+        init(self, "docstring", docstring)
+        init(self, "signature", signature)
+        init(self, "is_classmethod", is_classmethod)
+        init(self, "is_staticmethod", is_staticmethod)
+        init(self, "is_property", is_property)
+
+
+class PropertyInfo(_MemberInfo):
+    """
+    Metadata about a public property.
+
+    Fields are plain attributes (``info.has_setter``), and the object can
+    also be read like the dict it replaces (``info["has_setter"]``).
+    """
+
+    __slots__ = ("docstring", "has_setter", "has_deleter")
+
+    docstring: str
+    has_setter: bool
+    has_deleter: bool
+
+    def __init__(
+        self,
+        docstring: str = "",
+        has_setter: bool = False,
+        has_deleter: bool = False,
+    ) -> None:
+        init = object.__setattr__
+        init(self, "docstring", docstring)
+        init(self, "has_setter", has_setter)
+        init(self, "has_deleter", has_deleter)
 
 
 def get_type_path(cls: type) -> str:
@@ -45,10 +165,11 @@ def get_type_from_path(path: str) -> type:
 
     module_name, type_name = parts
 
-    # Import the module
-    import importlib
-
-    module = importlib.import_module(module_name)
+    # Modules already imported are a dict lookup away; only fall back to the
+    # import machinery (and its import lock) when the module is not loaded yet
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = importlib.import_module(module_name)
 
     # Get the type from the module
     # Handle nested classes
@@ -70,66 +191,186 @@ def extract_docstring(obj: Any) -> str:
     Returns:
         Docstring or empty string if none exists
     """
+    doc = getattr(obj, "__doc__", None)
+    if isinstance(doc, str):
+        # Own docstring: inspect.getdoc would only clean it up, and a single
+        # line needs no more than cleandoc does to a first line
+        if "\n" not in doc:
+            return doc.expandtabs().lstrip()
+        return inspect.cleandoc(doc)
+
+    # Fall back to getdoc to inherit the docstring of an overridden member
     doc = inspect.getdoc(obj)
     return doc if doc else ""
 
 
-def extract_public_methods(cls: type) -> dict[str, dict[str, Any]]:
+def format_signature(func: Callable[..., Any]) -> str:
     """
-    Extract all public methods from a class with their metadata.
+    Render the signature of a callable.
+
+    Signatures of plain functions and of methods bound to a class are
+    cached by their underlying function, so methods and classmethods
+    inherited by many registered classes are only inspected once.
 
     Args:
-        cls: The class to extract methods from
+        func: Callable to describe
 
     Returns:
-        Dictionary mapping method names to their metadata:
-        {
-            "method_name": {
-                "docstring": "...",
-                "signature": "...",
-                "is_classmethod": bool,
-                "is_staticmethod": bool,
-                "is_property": bool,
-            }
-        }
+        Signature string, or "()" if it cannot be determined
     """
-    methods = {}
+    key: Any = None
+    cache = _signature_cache
+    if inspect.isfunction(func):
+        key = func
+    elif inspect.ismethod(func) and inspect.isfunction(func.__func__):
+        key = func.__func__
+        cache = _bound_signature_cache
+
+    if key is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    try:
+        sig = str(inspect.signature(func))
+    except (ValueError, TypeError):
+        sig = "()"
+
+    if key is not None:
+        cache[key] = sig
+    return sig
+
+
+def _public_members(cls: type) -> Iterator[tuple[str, Any]]:
+    """
+    Yield each public name of a class with its statically resolved value.
 
-    for name, value in inspect.getmembers(cls):
-        # Skip private methods
+    Members are looked up with inspect.getattr_static, so descriptors such
+    as properties are returned as-is rather than evaluated.
+    """
+    names = set(dir(cls))
+    # Like inspect.getmembers, include dynamic attributes of the direct bases
+    # (e.g. Enum.name) that dir() hides
+    for base in cls.__bases__:
+        names.update(
+            key
+            for key, value in base.__dict__.items()
+            if isinstance(value, types.DynamicClassAttribute)
+        )
+
+    for name in sorted(names):
+        # Skip private members
         if name.startswith("_"):
             continue
 
-        # Check if it's a method, classmethod, staticmethod, or property
-        is_method = inspect.ismethod(value) or inspect.isfunction(value)
-        is_property = isinstance(inspect.getattr_static(cls, name), property)
-        is_classmethod = isinstance(inspect.getattr_static(cls, name), classmethod)
-        is_staticmethod = isinstance(inspect.getattr_static(cls, name), staticmethod)
-
-        if is_method or is_property or is_classmethod or is_staticmethod:
-            method_info = {
-                "docstring": extract_docstring(value),
-                "is_classmethod": is_classmethod,
-                "is_staticmethod": is_staticmethod,
-                "is_property": is_property,
-            }
-
-            # Get signature for methods (not properties)
-            if not is_property:
-                try:
-                    sig = inspect.signature(value)
-                    method_info["signature"] = str(sig)
-                except (ValueError, TypeError):
-                    method_info["signature"] = "()"
-            else:
-                method_info["signature"] = None
+        raw = inspect.getattr_static(cls, name, _MISSING)
+        if raw is not _MISSING:
+            yield name, raw
 
-            methods[name] = method_info
 
+def _resolve_member(cls: type, name: str, raw: Any) -> Any:
+    """
+    Get what a descriptor resolves to on the class, or the descriptor itself
+    if reading it from the class fails.
+    """
+    try:
+        return getattr(cls, name)
+    except Exception:
+        return raw
+
+
+def _method_info(cls: type, name: str, raw: Any) -> MethodInfo | None:
+    """Describe a member if it is a method, classmethod, staticmethod or property."""
+    if isinstance(raw, property):
+        # Properties have no call signature
+        return MethodInfo(
+            docstring=extract_docstring(raw), signature=None, is_property=True
+        )
+    if isinstance(raw, classmethod):
+        bound = raw.__get__(None, cls)
+        return MethodInfo(
+            docstring=extract_docstring(bound),
+            signature=format_signature(bound),
+            is_classmethod=True,
+        )
+    if isinstance(raw, staticmethod):
+        func = raw.__func__
+        return MethodInfo(
+            docstring=extract_docstring(func),
+            signature=format_signature(func),
+            is_staticmethod=True,
+        )
+    if inspect.isfunction(raw):
+        return MethodInfo(
+            docstring=extract_docstring(raw), signature=format_signature(raw)
+        )
+    if hasattr(type(raw), "__get__"):
+        # Other descriptors (e.g. functools.partialmethod) are methods if
+        # they resolve to one on the class
+        value = _resolve_member(cls, name, raw)
+        if inspect.ismethod(value) or inspect.isfunction(value):
+            return MethodInfo(
+                docstring=extract_docstring(value), signature=format_signature(value)
+            )
+    return None
+
+
+def _property_info(raw: Any) -> PropertyInfo | None:
+    """Describe a member if it is a property."""
+    if not isinstance(raw, property):
+        return None
+    return PropertyInfo(
+        docstring=extract_docstring(raw.fget) if raw.fget else "",
+        has_setter=raw.fset is not None,
+        has_deleter=raw.fdel is not None,
+    )
+
+
+def _attribute_info(
+    cls: type, name: str, raw: Any, annotations: dict[str, Any]
+) -> dict[str, Any] | None:
+    """Describe a member if it is a class attribute rather than a method."""
+    if isinstance(raw, (property, classmethod)) or inspect.isfunction(raw):
+        return None
+
+    # Other descriptors are described by what the class attribute resolves
+    # to, or by the descriptor itself if it cannot be read from the class
+    value = _resolve_member(cls, name, raw)
+    if inspect.ismethod(value) or inspect.isfunction(value):
+        return None
+
+    return {
+        "value": repr(value) if not callable(value) else "<callable>",
+        "type": annotations.get(name),
+    }
+
+
+def _class_annotations(cls: type) -> dict[str, Any]:
+    """Get the annotations declared on a class, if any."""
+    return cls.__annotations__ if hasattr(cls, "__annotations__") else {}
+
+
+def extract_public_methods(cls: type) -> dict[str, MethodInfo]:
+    """
+    Extract all public methods from a class with their metadata.
+
+    Args:
+        cls: The class to extract methods from
+
+    Returns:
+        Dictionary mapping method names to MethodInfo records with docstring,
+        signature (None for properties), is_classmethod, is_staticmethod
+        and is_property fields
+    """
+    methods = {}
+    for name, raw in _public_members(cls):
+        info = _method_info(cls, name, raw)
+        if info is not None:
+            methods[name] = info
     return methods
 
 
-def extract_public_properties(cls: type) -> dict[str, dict[str, Any]]:
+def extract_public_properties(cls: type) -> dict[str, PropertyInfo]:
     """
     Extract all public properties from a class with their metadata.
 
@@ -137,33 +378,14 @@ def extract_public_properties(cls: type) -> dict[str, dict[str, Any]]:
         cls: The class to extract properties from
 
     Returns:
-        Dictionary mapping property names to their metadata:
-        {
-            "property_name": {
-                "docstring": "...",
-                "has_setter": bool,
-                "has_deleter": bool,
-            }
-        }
+        Dictionary mapping property names to PropertyInfo records with
+        docstring, has_setter and has_deleter fields
     """
     properties = {}
-
-    for name in dir(cls):
-        # Skip private attributes
-        if name.startswith("_"):
-            continue
-
-        try:
-            attr = inspect.getattr_static(cls, name)
-            if isinstance(attr, property):
-                properties[name] = {
-                    "docstring": extract_docstring(attr.fget) if attr.fget else "",
-                    "has_setter": attr.fset is not None,
-                    "has_deleter": attr.fdel is not None,
-                }
-        except AttributeError:
-            continue
-
+    for name, raw in _public_members(cls):
+        info = _property_info(raw)
+        if info is not None:
+            properties[name] = info
     return properties
 
 
@@ -177,31 +399,12 @@ def extract_class_attributes(cls: type) -> dict[str, Any]:
     Returns:
         Dictionary mapping attribute names to their types
     """
+    annotations = _class_annotations(cls)
     attributes = {}
-
-    for name, value in inspect.getmembers(cls):
-        # Skip private attributes
-        if name.startswith("_"):
-            continue
-
-        # Skip methods and properties
-        if (
-            inspect.ismethod(value)
-            or inspect.isfunction(value)
-            or isinstance(inspect.getattr_static(cls, name), property)
-        ):
-            continue
-
-        # Get type hint if available
-        type_hint = None
-        if hasattr(cls, "__annotations__") and name in cls.__annotations__:
-            type_hint = cls.__annotations__[name]
-
-        attributes[name] = {
-            "value": repr(value) if not callable(value) else "<callable>",
-            "type": type_hint,
-        }
-
+    for name, raw in _public_members(cls):
+        info = _attribute_info(cls, name, raw, annotations)
+        if info is not None:
+            attributes[name] = info
     return attributes
 
 
@@ -209,12 +412,64 @@ def extract_type_metadata(cls: type) -> dict[str, Any]:
     """
     Extract comprehensive metadata from a type.
 
+    The result is cached per class, so registering the same class again
+    (re-imports, re-applied decorators) skips introspection. Each call
+    returns new dictionaries and lists, so callers cannot change the cached
+    copy; the read-only member records are shared. Call clear_cache() after
+    changing a class at runtime.
+
     Args:
         cls: The type to extract metadata from
 
     Returns:
         Dictionary containing all extracted metadata
     """
+    cached = _metadata_cache.get(cls)
+    if cached is None:
+        cached = _metadata_cache[cls] = _extract_type_metadata(cls)
+    metadata = dict(cached)
+    metadata["bases"] = list(cached["bases"])
+    metadata["methods"] = dict(cached["methods"])
+    metadata["properties"] = dict(cached["properties"])
+    metadata["attributes"] = {
+        name: dict(info) for name, info in cached["attributes"].items()
+    }
+    return metadata
+
+
+def clear_cache() -> None:
+    """
+    Forget all cached metadata and signatures.
+
+    Classes changed after they were first introspected (for example when a
+    notebook cell redefining methods is re-run) are introspected again.
+    """
+    _metadata_cache.clear()
+    _signature_cache.clear()
+    _bound_signature_cache.clear()
+
+
+def _extract_type_metadata(cls: type) -> dict[str, Any]:
+    """
+    Introspect a type, collecting methods, properties and attributes in a
+    single walk over the class members.
+    """
+    methods: dict[str, MethodInfo] = {}
+    properties: dict[str, PropertyInfo] = {}
+    attributes: dict[str, Any] = {}
+    annotations = _class_annotations(cls)
+
+    for name, raw in _public_members(cls):
+        method_info = _method_info(cls, name, raw)
+        if method_info is not None:
+            methods[name] = method_info
+        property_info = _property_info(raw)
+        if property_info is not None:
+            properties[name] = property_info
+        attribute_info = _attribute_info(cls, name, raw, annotations)
+        if attribute_info is not None:
+            attributes[name] = attribute_info
+
     return {
         "path": get_type_path(cls),
         "name": cls.__name__,
@@ -222,8 +477,8 @@ def extract_type_metadata(cls: type) -> dict[str, Any]:
         "module": cls.__module__,
         "docstring": extract_docstring(cls),
         "bases": [get_type_path(base) for base in cls.__bases__ if base is not object],
-        "methods": extract_public_methods(cls),
-        "properties": extract_public_properties(cls),
-        "attributes": extract_class_attributes(cls),
+        "methods": methods,
+        "properties": properties,
+        "attributes": attributes,
         "is_abstract": inspect.isabstract(cls),
     }
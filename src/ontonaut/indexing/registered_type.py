@@ -2,13 +2,38 @@
 RegisteredType class that holds metadata about indexed types.
 """
 
+import inspect
+from collections.abc import Mapping
+from itertools import islice
+from types import MappingProxyType
 from typing import Any
 
 from ontonaut.indexing.metadata import (
+    MethodInfo,
+    PropertyInfo,
+    extract_docstring,
     extract_type_metadata,
     get_type_from_path,
+    get_type_path,
 )
-from ontonaut.indexing.tags import IndexTag
+from ontonaut.indexing.tags import IndexTag, tag_mask
+
+
+def _annotation_text(annotation: Any) -> str | None:
+    """Format a class attribute annotation as text, keeping string annotations."""
+    if annotation is None or isinstance(annotation, str):
+        return annotation
+    return inspect.formatannotation(annotation)
+
+
+def _lowercase_index(
+    members: Mapping[str, MethodInfo | PropertyInfo],
+) -> tuple[tuple[str, str, str], ...]:
+    """Pair each member name with its lowercased name and docstring."""
+    return tuple(
+        (name, name.lower(), (info.docstring or "").lower())
+        for name, info in members.items()
+    )
 
 
 class RegisteredType:
@@ -24,6 +49,26 @@ class RegisteredType:
     - Class attributes
     """
 
+    # Registries may hold thousands of these; slots drop the per-instance dict
+    __slots__ = (
+        "_cls",
+        "_tags",
+        "_tag_names",
+        "_tag_set",
+        "_instructions",
+        "_tag_mask",
+        "_cls_path",
+        "_docstring",
+        "_metadata",
+        "_metadata_view",
+        "_search_blob",
+        "_lowercase_fields",
+        "_full_text",
+        "_context_snippet",
+        "_method_index",
+        "_property_index",
+    )
+
     def __init__(
         self,
         cls: type,
@@ -39,11 +84,30 @@ class RegisteredType:
             instructions: Custom instructions or description
         """
         self._cls = cls
-        self._tags = tags or []
+        # Frozen so callers cannot change the tags behind the derived fields
+        self._tags: tuple[IndexTag, ...] = tuple(tags) if tags else ()
+        self._tag_names = tuple(str(tag) for tag in self._tags)
+        self._tag_set = frozenset(self._tag_names)
         self._instructions = instructions
-
-        # Extract and cache all metadata
-        self._metadata = extract_type_metadata(cls)
+        self._tag_mask = tag_mask(self._tags)
+
+        self._cls_path = get_type_path(cls)
+        self._docstring = extract_docstring(cls)
+
+        # Introspection of members is deferred until first needed
+        self._metadata: dict[str, Any] | None = None
+        self._metadata_view: Mapping[str, Any] | None = None
+
+        # Lowercased text matched by registry queries, joined with a separator
+        # that never appears in queries so matches cannot span two fields
+        self._search_blob = "\0".join(
+            (self.name, self.docstring, self.instructions, self.module)
+        ).lower()
+        self._lowercase_fields: tuple[tuple[str, str], ...] | None = None
+        self._full_text: str | None = None
+        self._context_snippet: str | None = None
+        self._method_index: tuple[tuple[str, str, str], ...] | None = None
+        self._property_index: tuple[tuple[str, str, str], ...] | None = None
 
     @property
     def cls(self) -> type:
@@ -53,28 +117,33 @@ class RegisteredType:
     @property
     def cls_path(self) -> str:
         """Get the fully qualified path of the type."""
-        return self._metadata["path"]
+        return self._cls_path
 
     @property
     def name(self) -> str:
         """Get the simple name of the type."""
-        return self._metadata["name"]
+        return self._cls.__name__
 
     @property
     def qualname(self) -> str:
         """Get the qualified name (includes parent classes)."""
-        return self._metadata["qualname"]
+        return self._cls.__qualname__
 
     @property
     def module(self) -> str:
         """Get the module name."""
-        return self._metadata["module"]
+        return self._cls.__module__
 
     @property
-    def tags(self) -> list[IndexTag]:
-        """Get the list of tags."""
+    def tags(self) -> tuple[IndexTag, ...]:
+        """Get the tags, in registration order."""
         return self._tags
 
+    @property
+    def tag_names(self) -> tuple[str, ...]:
+        """Get the string values of the tags, in order."""
+        return self._tag_names
+
     @property
     def instructions(self) -> str:
         """Get the custom instructions."""
@@ -83,67 +152,146 @@ class RegisteredType:
     @property
     def docstring(self) -> str:
         """Get the class docstring."""
-        return self._metadata["docstring"]
+        return self._docstring
 
     @property
     def bases(self) -> list[str]:
         """Get the base class paths."""
-        return self._metadata["bases"]
+        return self._extracted_metadata["bases"]
 
     @property
-    def methods(self) -> dict[str, dict[str, Any]]:
+    def methods(self) -> dict[str, MethodInfo]:
         """
         Get all public methods with their metadata.
 
         Returns:
-            Dictionary mapping method names to their metadata:
-            {
-                "method_name": {
-                    "docstring": "...",
-                    "signature": "...",
-                    "is_classmethod": bool,
-                    "is_staticmethod": bool,
-                    "is_property": bool,
-                }
-            }
+            Dictionary mapping method names to MethodInfo records, whose
+            fields (docstring, signature, is_classmethod, is_staticmethod,
+            is_property) can be read as attributes or by key
         """
-        return self._metadata["methods"]
+        return self._extracted_metadata["methods"]
 
     @property
-    def properties(self) -> dict[str, dict[str, Any]]:
+    def properties(self) -> dict[str, PropertyInfo]:
         """
         Get all public properties with their metadata.
 
         Returns:
-            Dictionary mapping property names to their metadata:
-            {
-                "property_name": {
-                    "docstring": "...",
-                    "has_setter": bool,
-                    "has_deleter": bool,
-                }
-            }
+            Dictionary mapping property names to PropertyInfo records, whose
+            fields (docstring, has_setter, has_deleter) can be read as
+            attributes or by key
         """
-        return self._metadata["properties"]
+        return self._extracted_metadata["properties"]
 
     @property
     def attributes(self) -> dict[str, Any]:
         """Get all class-level attributes."""
-        return self._metadata["attributes"]
+        return self._extracted_metadata["attributes"]
 
     @property
     def is_abstract(self) -> bool:
         """Check if the type is abstract."""
-        return self._metadata["is_abstract"]
+        return self._extracted_metadata["is_abstract"]
 
     @property
-    def metadata(self) -> dict[str, Any]:
-        """Get the complete metadata dictionary."""
-        return {
-            **self._metadata,
-            "tags": [str(tag) for tag in self._tags],
-            "instructions": self._instructions,
-        }
+    def metadata(self) -> Mapping[str, Any]:
+        """
+        Get the complete metadata.
+
+        The mapping is built on first access and shared by later calls, so it
+        is read-only; copy it with ``dict()`` to modify it.
+        """
+        if self._metadata_view is None:
+            self._metadata_view = MappingProxyType(
+                {
+                    **self._extracted_metadata,
+                    "tags": self._tag_names,
+                    "instructions": self._instructions,
+                }
+            )
+        return self._metadata_view
+
+    @property
+    def _extracted_metadata(self) -> dict[str, Any]:
+        """Get the introspected metadata, extracting it on first use."""
+        if self._metadata is None:
+            self._metadata = extract_type_metadata(self._cls)
+        return self._metadata
+
+    @property
+    def lowercase_fields(self) -> tuple[tuple[str, str], ...]:
+        """
+        Get every searchable field, lowercased, paired with its kind.
+
+        Kinds are "name", "module", "docstring", "instructions", "tag",
+        "method", "method_doc", "property" and "property_doc". The fields are
+        lowercased once and reused, so callers scoring many queries against
+        the same type do not lowercase them again.
+        """
+        if self._lowercase_fields is None:
+            fields = [
+                ("name", self.name.lower()),
+                ("module", self.module.lower()),
+                ("docstring", self.docstring.lower()),
+                ("instructions", self._instructions.lower()),
+            ]
+            fields.extend(("tag", name.lower()) for name in self._tag_names)
+            for name, method_info in self.methods.items():
+                fields.append(("method", name.lower()))
+                fields.append(("method_doc", (method_info.docstring or "").lower()))
+            for name, prop_info in self.properties.items():
+                fields.append(("property", name.lower()))
+                fields.append(("property_doc", (prop_info.docstring or "").lower()))
+            self._lowercase_fields = tuple(fields)
+        return self._lowercase_fields
+
+    @property
+    def full_text(self) -> str:
+        """
+        Get the lowercased text of every searchable field.
+
+        Covers the name, module, docstring, instructions, tags, and the names
+        and docstrings of all methods and properties, separated by NUL
+        characters. Any keyword found in one of those fields is found here.
+        """
+        if self._full_text is None:
+            self._full_text = "\0".join(text for _, text in self.lowercase_fields)
+        return self._full_text
+
+    @property
+    def context_snippet(self) -> str:
+        """
+        Get the Markdown summary of this type used as AI prompt context.
+
+        Lists the path, tags, description, notes, and the first five methods
+        and three properties. The text is formatted once and reused, since
+        re-registering a type creates a new RegisteredType.
+        """
+        if self._context_snippet is None:
+            parts = [
+                f"## {self.cls_path}\n",
+                f"**Tags:** {', '.join(self._tag_names)}\n",
+                f"**Description:** {self.docstring}\n",
+            ]
+            if self._instructions:
+                parts.append(f"**Notes:** {self._instructions}\n")
+
+            parts.append("\n### Methods:\n")
+            for method_name, method_info in islice(self.methods.items(), 5):
+                sig = method_info.signature or "()"
+                parts.append(f"- `{method_name}{sig}`")
+                if method_info.docstring:
+                    parts.append(f": {method_info.docstring[:100]}")
+                parts.append("\n")
+
+            if self.properties:
+                parts.append("\n### Properties:\n")
+                for prop_name, prop_info in islice(self.properties.items(), 3):
+                    parts.append(f"- `{prop_name}`: {prop_info.docstring[:80]}\n")
+
+            parts.append("\n")
+            self._context_snippet = "".join(parts)
+        return self._context_snippet
 
     def has_tag(self, tag: IndexTag | str) -> bool:
         """
@@ -155,8 +303,7 @@ class RegisteredType:
         Returns:
             True if the tag is present
         """
-        tag_str = str(tag)
-        return any(str(t) == tag_str for t in self._tags)
+        return str(tag) in self._tag_set
 
     def has_any_tag(self, tags: list[IndexTag | str]) -> bool:
         """
@@ -168,7 +315,7 @@ class RegisteredType:
         Returns:
             True if any tag is present
         """
-        return any(self.has_tag(tag) for tag in tags)
+        return not self._tag_set.isdisjoint(map(str, tags))
 
     def has_all_tags(self, tags: list[IndexTag | str]) -> bool:
         """
@@ -180,9 +327,9 @@ class RegisteredType:
         Returns:
             True if all tags are present
         """
-        return all(self.has_tag(tag) for tag in tags)
+        return self._tag_set.issuperset(map(str, tags))
 
-    def search_methods(self, query: str) -> dict[str, dict[str, Any]]:
+    def search_methods(self, query: str) -> dict[str, MethodInfo]:
         """
         Search methods by name or docstring.
 
@@ -192,14 +339,18 @@ class RegisteredType:
         Returns:
             Dictionary of matching methods
         """
+        if self._method_index is None:
+            self._method_index = _lowercase_index(self.methods)
+
         query_lower = query.lower()
+        methods = self.methods
         return {
-            name: info
-            for name, info in self.methods.items()
-            if query_lower in name.lower() or query_lower in info["docstring"].lower()
+            name: methods[name]
+            for name, name_lower, doc_lower in self._method_index
+            if query_lower in name_lower or query_lower in doc_lower
         }
 
-    def search_properties(self, query: str) -> dict[str, dict[str, Any]]:
+    def search_properties(self, query: str) -> dict[str, PropertyInfo]:
         """
         Search properties by name or docstring.
 
@@ -209,11 +360,15 @@ class RegisteredType:
         Returns:
             Dictionary of matching properties
         """
+        if self._property_index is None:
+            self._property_index = _lowercase_index(self.properties)
+
         query_lower = query.lower()
+        properties = self.properties
         return {
-            name: info
-            for name, info in self.properties.items()
-            if query_lower in name.lower() or query_lower in info["docstring"].lower()
+            name: properties[name]
+            for name, name_lower, doc_lower in self._property_index
+            if query_lower in name_lower or query_lower in doc_lower
         }
 
     def to_dict(self) -> dict[str, Any]:
@@ -221,15 +376,28 @@ class RegisteredType:
         Convert to a dictionary representation.
 
         Returns:
-            Dictionary containing all data
+            Dictionary containing all data, with method and property records
+            converted to plain dictionaries and attribute annotations
+            formatted as text. Nothing in it is shared with this type, so the
+            result can be serialized to JSON or modified freely
         """
+        metadata = dict(self.metadata)
+        for members in ("methods", "properties"):
+            metadata[members] = {
+                name: info._asdict() for name, info in metadata[members].items()
+            }
+        metadata["attributes"] = {
+            name: {**info, "type": _annotation_text(info["type"])}
+            for name, info in metadata["attributes"].items()
+        }
+        metadata["bases"] = list(metadata["bases"])
         return {
             "cls_path": self.cls_path,
             "name": self.name,
             "module": self.module,
-            "tags": [str(tag) for tag in self.tags],
+            "tags": list(self._tag_names),
             "instructions": self.instructions,
-            "metadata": self.metadata,
+            "metadata": metadata,
         }
 
     @classmethod
@@ -257,7 +425,7 @@ class RegisteredType:
         return cls(type_cls, tags=tags, instructions=instructions)
 
     def __repr__(self) -> str:
-        tag_str = ", ".join(str(t) for t in self._tags)
+        tag_str = ", ".join(self._tag_names)
         return f"RegisteredType({self.cls_path}, tags=[{tag_str}])"
 
     def __str__(self) -> str:
@@ -2,22 +2,81 @@
 Thread-safe registry for indexed types.
 """
 
+import contextlib
+import functools
+import itertools
 import threading
+from collections.abc import Iterator
 from typing import Callable
 
+from ontonaut.indexing.fuzzy import BKTree, identifier_words
+from ontonaut.indexing.haystack import SEPARATOR, Haystack
+from ontonaut.indexing.metadata import clear_cache, get_type_path
 from ontonaut.indexing.registered_type import RegisteredType
-from ontonaut.indexing.tags import IndexTag
+from ontonaut.indexing.tags import IndexTag, lookup_tag_mask
+from ontonaut.indexing.words import WordIndex, tokenize
+
+# Above this many candidates a query is confirmed with one scan over all
+# search text instead of a per-type substring check
+_SCAN_THRESHOLD = 256
+
+
+def _index_words(registered: RegisteredType) -> set[str]:
+    """Collect the words a registered type is indexed under."""
+    return set(tokenize(registered._search_blob))
+
+
+def _fuzzy_terms(registered: RegisteredType) -> set[str]:
+    """Collect the name words a registered type is fuzzy-matched on."""
+    terms = identifier_words(registered.name)
+    for name in (*registered.methods, *registered.properties):
+        terms |= identifier_words(name)
+    return terms
+
+
+def _fuzzy_radius(token: str) -> int:
+    """Allow one edit in short words and two in longer ones."""
+    return 1 if len(token) <= 4 else 2
 
 
 class TypeRegistry:
     """
     Thread-safe registry for storing and querying registered types.
+
+    Mutations hold the lock. Single lookups, ``len`` and ``get_all`` read
+    the registry dict without it, since each is one atomic dict operation,
+    and cached searches only lock to index types pending from a batch.
     """
 
     def __init__(self) -> None:
         self._registry: dict[str, RegisteredType] = {}
+        # Lookups by class hash the class itself instead of formatting its path
+        self._by_cls: dict[type, RegisteredType] = {}
         self._lock = threading.RLock()
 
+        # Word index: each path gets a stable integer id for its lifetime
+        self._words = WordIndex()
+        self._ids: dict[str, int] = {}
+        self._by_id: dict[int, RegisteredType] = {}
+        self._blobs: dict[int, str] = {}
+        self._tag_masks: dict[int, int] = {}
+        # Inverted tag index: tag value -> ids of the types carrying it
+        self._tag_ids: dict[str, set[int]] = {}
+        self._id_counter = itertools.count()
+
+        # Search results are memoized per registry version; stale versions
+        # are never looked up again, so a search racing a mutation is harmless
+        self._version = 0
+        self._cached_search = functools.lru_cache(maxsize=512)(self._search)
+        self._haystack: Haystack | None = None
+        # BK-trees cannot drop entries cheaply, so the fuzzy index is rebuilt
+        # on the first fuzzy search after a change
+        self._bktree: BKTree | None = None
+
+        # Types registered inside batch() are indexed together on exit
+        self._batch_depth = 0
+        self._pending: set[int] = set()
+
     def register(
         self,
         cls: type,
@@ -35,11 +94,74 @@ class TypeRegistry:
         Returns:
             The RegisteredType instance
         """
+        # Built before locking, so threads registering at once only serialize
+        # on the index updates
+        registered = RegisteredType(cls, tags=tags, instructions=instructions)
+        path = registered.cls_path
         with self._lock:
-            registered = RegisteredType(cls, tags=tags, instructions=instructions)
-            self._registry[registered.cls_path] = registered
+
+            type_id = self._ids.get(path)
+            if type_id is None:
+                type_id = self._ids[path] = next(self._id_counter)
+            else:
+                previous = self._by_id[type_id]
+                self._forget_cls(previous)
+                self._unindex_tags(previous, type_id)
+                if type_id not in self._pending:
+                    self._words.remove(_index_words(previous), type_id)
+
+            self._registry[path] = registered
+            self._by_cls[cls] = registered
+            self._by_id[type_id] = registered
+            self._blobs[type_id] = registered._search_blob
+            self._tag_masks[type_id] = registered._tag_mask
+            for name in registered._tag_set:
+                self._tag_ids.setdefault(name, set()).add(type_id)
+
+            if self._batch_depth:
+                self._pending.add(type_id)
+            else:
+                self._words.insert(_index_words(registered), type_id)
+                self._invalidate()
             return registered
 
+    @contextlib.contextmanager
+    def batch(self) -> Iterator["TypeRegistry"]:
+        """
+        Defer indexing while registering many types.
+
+        Types registered inside the block are stored immediately but added to
+        the search index, and caches invalidated, once on exit. A search made
+        inside the block indexes the pending types first. Batches may nest.
+
+        Usage:
+            ```python
+            with get_registry().batch():
+                for cls in many_classes:
+                    register_type(cls)
+            ```
+
+        Yields:
+            This registry
+        """
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush()
+
+    def _flush(self) -> None:
+        """Index types registered during a batch and invalidate caches once."""
+        if self._pending:
+            for type_id in sorted(self._pending):
+                self._words.insert(_index_words(self._by_id[type_id]), type_id)
+            self._pending.clear()
+            self._invalidate()
+
     def unregister(self, cls: type | str) -> None:
         """
         Unregister a type from the registry.
@@ -47,16 +169,31 @@ class TypeRegistry:
         Args:
             cls: The type or type path to unregister
         """
+        path = cls if isinstance(cls, str) else get_type_path(cls)
         with self._lock:
-            if isinstance(cls, str):
-                path = cls
+            type_id = self._ids.get(path)
+            if type_id is None:
+                return
+            removed = self._by_id[type_id]
+            self._forget_cls(removed)
+            del self._registry[path]
+            del self._ids[path]
+            del self._by_id[type_id]
+            self._unindex_tags(removed, type_id)
+            if type_id in self._pending:
+                self._pending.discard(type_id)
             else:
-                from ontonaut.indexing.metadata import get_type_path
-
-                path = get_type_path(cls)
-
-            if path in self._registry:
-                del self._registry[path]
+                self._words.remove(_index_words(removed), type_id)
+            del self._blobs[type_id]
+            del self._tag_masks[type_id]
+            self._invalidate()
+
+    def _forget_cls(self, registered: RegisteredType) -> None:
+        """Drop the class lookup entry if it still points at this registration."""
+        # The class may have been registered again under another path since
+        # (e.g. after its __qualname__ changed), which owns the entry now
+        if self._by_cls.get(registered.cls) is registered:
+            del self._by_cls[registered.cls]
 
     def get(self, cls: type | str) -> RegisteredType | None:
         """
@@ -68,79 +205,184 @@ class TypeRegistry:
         Returns:
             RegisteredType if found, None otherwise
         """
-        with self._lock:
-            if isinstance(cls, str):
-                path = cls
-            else:
-                from ontonaut.indexing.metadata import get_type_path
-
-                path = get_type_path(cls)
-
-            return self._registry.get(path)
+        if isinstance(cls, str):
+            return self._registry.get(cls)
+        registered = self._by_cls.get(cls)
+        if registered is None:
+            # Another class object may have been registered under this path
+            registered = self._registry.get(get_type_path(cls))
+        return registered
 
     def get_all(self) -> list[RegisteredType]:
         """Get all registered types."""
+        return list(self._registry.values())
+
+    def tag_counts(self) -> dict[str, int]:
+        """
+        Count the registered types carrying each tag.
+
+        Counts are read from the inverted tag index, so this does not scan
+        the registry.
+
+        Returns:
+            Dictionary mapping tag values to type counts, most common first
+        """
         with self._lock:
-            return list(self._registry.values())
+            counts = [(name, len(ids)) for name, ids in self._tag_ids.items()]
+        counts.sort(key=lambda item: item[1], reverse=True)
+        return dict(counts)
+
+    def _unindex_tags(self, registered: RegisteredType, type_id: int) -> None:
+        """Remove a type from the inverted index of each of its tags."""
+        for name in registered._tag_set:
+            ids = self._tag_ids[name]
+            ids.discard(type_id)
+            if not ids:
+                del self._tag_ids[name]
 
     def search(
         self,
-        query: str | None = None,
+        query: str | list[str] | None = None,
         tags: list[IndexTag | str] | None = None,
         require_all_tags: bool = False,
+        fuzzy: bool = False,
     ) -> list[RegisteredType]:
         """
         Search registered types.
 
         Args:
-            query: Search query (searches name, docstring, instructions)
+            query: Search query (searches name, docstring, instructions), or
+                a list of terms that must each be found
             tags: Filter by tags
             require_all_tags: If True, require all tags; if False, require any tag
+            fuzzy: If True, match each query word against type, method and
+                property names within a small edit distance instead of
+                requiring the exact query text
 
         Returns:
             List of matching RegisteredType instances
         """
-        with self._lock:
-            results = list(self._registry.values())
+        if isinstance(query, str):
+            query = [query]
+        terms = tuple(term.lower() for term in query or () if term)
+        tag_key = frozenset(str(tag) for tag in tags) if tags else frozenset()
+        if self._pending:
+            with self._lock:
+                self._flush()
+        version = self._version
+        return list(
+            self._cached_search(version, terms, tag_key, require_all_tags, fuzzy)
+        )
 
-            # Filter by tags
-            if tags:
+    def _search(
+        self,
+        version: int,
+        terms: tuple[str, ...],
+        tags: frozenset[str],
+        require_all_tags: bool,
+        fuzzy: bool,
+    ) -> tuple[RegisteredType, ...]:
+        """Run an uncached search; ``version`` only keys the result cache."""
+        with self._lock:
+            # Ids follow registration order, as does iteration over _by_id
+            ids: list[int] = list(self._by_id)
+
+            # Narrow to types containing every word of every term; terms
+            # without any words are checked against every type below
+            tokens = [token for term in terms for token in tokenize(term)]
+            if fuzzy and tokens:
+                tree = self._fuzzy_index()
+                ids = sorted(
+                    set.intersection(
+                        *(tree.search(token, _fuzzy_radius(token)) for token in tokens)
+                    )
+                )
+            elif tokens:
+                ids = sorted(
+                    set.intersection(*(self._words.lookup(token) for token in tokens))
+                )
+
+            # Without query words, start from the types carrying the tags
+            # rather than from every type
+            if tags and not tokens:
+                tagged = [self._tag_ids.get(name, set()) for name in tags]
                 if require_all_tags:
-                    results = [r for r in results if r.has_all_tags(tags)]
+                    ids = sorted(set.intersection(*tagged))
                 else:
-                    results = [r for r in results if r.has_any_tag(tags)]
-
-            # Filter by query
-            if query:
-                query_lower = query.lower()
-                results = [
-                    r
-                    for r in results
-                    if (
-                        query_lower in r.name.lower()
-                        or query_lower in r.docstring.lower()
-                        or query_lower in r.instructions.lower()
-                        or query_lower in r.module.lower()
-                    )
-                ]
+                    ids = sorted(set().union(*tagged))
+
+            # Otherwise filter the word matches by tags with one AND per type
+            elif tags:
+                query_mask, all_known = lookup_tag_mask(tags)
+                masks = self._tag_masks
+                if require_all_tags and not all_known:
+                    # No type carries a tag that was never registered
+                    ids = []
+                elif require_all_tags:
+                    ids = [i for i in ids if masks[i] & query_mask == query_mask]
+                else:
+                    ids = [i for i in ids if masks[i] & query_mask]
+
+            # Confirm each full term against the precomputed lowercase text;
+            # every term shrinks the candidates left for the next one
+            for term in () if fuzzy else terms:
+                if len(ids) > _SCAN_THRESHOLD and SEPARATOR not in term:
+                    if self._haystack is None:
+                        self._haystack = Haystack(self._blobs)
+                    hits = self._haystack.find_all(term)
+                    ids = [i for i in ids if i in hits]
+                else:
+                    blobs = self._blobs
+                    ids = [i for i in ids if term in blobs[i]]
+
+            return tuple(self._by_id[i] for i in ids)
+
+    def _fuzzy_index(self) -> BKTree:
+        """Get the BK-tree of name words, building it if stale."""
+        if self._bktree is None:
+            tree = BKTree()
+            for type_id, registered in self._by_id.items():
+                for term in _fuzzy_terms(registered):
+                    tree.add(term, type_id)
+            self._bktree = tree
+        return self._bktree
+
+    @property
+    def version(self) -> int:
+        """Counter incremented on every change to the registered types."""
+        with self._lock:
+            self._flush()
+            return self._version
 
-            return results
+    def _invalidate(self) -> None:
+        """Bump the version and drop cached search results."""
+        self._version += 1
+        self._cached_search.cache_clear()
+        self._haystack = None
+        self._bktree = None
 
     def clear(self) -> None:
         """Clear all registered types."""
         with self._lock:
             self._registry.clear()
+            self._by_cls.clear()
+            self._words.clear()
+            self._ids.clear()
+            self._by_id.clear()
+            self._blobs.clear()
+            self._tag_masks.clear()
+            self._tag_ids.clear()
+            self._pending.clear()
+            self._invalidate()
 
     def __len__(self) -> int:
-        with self._lock:
-            return len(self._registry)
+        return len(self._registry)
 
     def __contains__(self, cls: type | str) -> bool:
         return self.get(cls) is not None
 
     def __repr__(self) -> str:
-        with self._lock:
-            return f"TypeRegistry(registered={len(self._registry)})"
+        return f"TypeRegistry(registered={len(self._registry)})"
 
 
 # Global registry instance
@@ -246,23 +488,28 @@ def clear_registry() -> None:
     """
     Clear all registered types from the global registry.
 
-    Useful for testing or resetting state.
+    Useful for testing or resetting state. Cached class metadata is dropped
+    too, so classes changed since they were registered are introspected again.
     """
     _index_register.clear()
+    clear_cache()
 
 
 def search_registry(
-    query: str | None = None,
+    query: str | list[str] | None = None,
     tags: list[IndexTag | str] | None = None,
     require_all_tags: bool = False,
+    fuzzy: bool = False,
 ) -> list[RegisteredType]:
     """
     Search the global registry for types.
 
     Args:
-        query: Search query (searches name, docstring, instructions)
+        query: Search query (searches name, docstring, instructions), or a
+            list of terms that must each be found
         tags: Filter by tags
         require_all_tags: If True, require all tags; if False, require any tag
+        fuzzy: If True, tolerate misspelled type, method and property names
 
     Returns:
         List of matching RegisteredType instances
@@ -272,13 +519,19 @@ def search_registry(
         # Search by query
         results = search_registry("user")
 
+        # Require several terms, in any order
+        results = search_registry(["user", "password reset"])
+
         # Search by tags
         results = search_registry(tags=[MyTags.DATABASE])
 
         # Combined search
         results = search_registry("model", tags=[MyTags.DATABASE])
+
+        # Tolerate typos in names
+        results = search_registry("authenitcate", fuzzy=True)
         ```
     """
     return _index_register.search(
-        query=query, tags=tags, require_all_tags=require_all_tags
+        query=query, tags=tags, require_all_tags=require_all_tags, fuzzy=fuzzy
     )
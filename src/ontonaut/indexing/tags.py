@@ -2,8 +2,15 @@
 Index tags for categorizing registered types.
 """
 
+import sys
+import threading
+from collections.abc import Iterable
 from enum import Enum
-from typing import Any
+
+# Bit assigned to each tag value, shared by every IndexTag subclass so that
+# tags compare by value (like has_tag) regardless of which enum they come from
+_tag_bits: dict[str, int] = {}
+_tag_bits_lock = threading.Lock()
 
 
 class IndexTag(str, Enum):
@@ -22,8 +29,21 @@ class IndexTag(str, Enum):
         ```
     """
 
+    def __new__(cls, value: object) -> "IndexTag":
+        if isinstance(value, str):
+            # Intern tag values so comparisons and dict lookups against other
+            # occurrences of the same tag usually succeed on identity alone
+            value = sys.intern(value)
+        else:
+            # Other values (e.g. auto() or ints) become their text, as with a
+            # plain str mixin
+            value = str(value)
+        member = str.__new__(cls, value)
+        member._value_ = value
+        return member
+
     def __str__(self) -> str:
-        return self.value
+        return str(self.value)
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}.{self.name}"
@@ -31,15 +51,77 @@ class IndexTag(str, Enum):
     @classmethod
     def from_string(cls, value: str) -> "IndexTag":
         """Create tag from string value."""
-        for tag in cls:
-            if tag.value == value:
-                return tag
-        raise ValueError(f"No {cls.__name__} with value '{value}'")
-
-    def __eq__(self, other: Any) -> bool:
-        if isinstance(other, str):
-            return self.value == other
-        return super().__eq__(other)
-
-    def __hash__(self) -> int:
-        return hash(self.value)
+        # Enum keeps a value -> member map, so no need to scan the members
+        tag = cls._value2member_map_.get(value)
+        if tag is None:
+            raise ValueError(f"No {cls.__name__} with value '{value}'")
+        return tag  # type: ignore[return-value]
+
+    # A member is itself a str holding its value, so plain string equality
+    # and hashing match by value (against strings and tags of any subclass),
+    # and the C implementations short-circuit on identical interned strings
+    __eq__ = str.__eq__
+    __hash__ = str.__hash__
+
+
+def tag_bit(tag: "IndexTag | str") -> int:
+    """
+    Get the bit assigned to a tag value, allocating one on first use.
+
+    Args:
+        tag: Tag or tag string
+
+    Returns:
+        Integer with a single bit set
+    """
+    value = str(tag)
+    bit = _tag_bits.get(value)
+    if bit is None:
+        with _tag_bits_lock:
+            bit = _tag_bits.setdefault(sys.intern(value), 1 << len(_tag_bits))
+    return bit
+
+
+def lookup_tag_mask(tags: Iterable["IndexTag | str"]) -> tuple[int, bool]:
+    """
+    Combine tags into a bitmask without allocating bits for new values.
+
+    Meant for query tags, which may be arbitrary strings: a tag no type was
+    ever registered with has no bit and matches nothing, so it is left out
+    instead of growing the global bit table.
+
+    Args:
+        tags: Tags or tag strings
+
+    Returns:
+        Tuple of the bitwise OR of the known tags' bits and whether every
+        tag was known
+    """
+    mask = 0
+    all_known = True
+    for tag in tags:
+        bit = _tag_bits.get(str(tag))
+        if bit is None:
+            all_known = False
+        else:
+            mask |= bit
+    return mask, all_known
+
+
+def tag_mask(tags: Iterable["IndexTag | str"]) -> int:
+    """
+    Combine tags into a bitmask, allocating bits for new tag values.
+
+    Only used for the tags a type is registered with; see lookup_tag_mask
+    for query tags.
+
+    Args:
+        tags: Tags or tag strings
+
+    Returns:
+        Bitwise OR of each tag's bit
+    """
+    mask = 0
+    for tag in tags:
+        mask |= tag_bit(tag)
+    return mask
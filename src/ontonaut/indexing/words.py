@@ -0,0 +1,124 @@
+"""
+Word index for looking up registered types by the words they contain.
+"""
+
+import re
+from collections.abc import Iterable
+
+from ontonaut.indexing.haystack import Haystack
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Tokens whose matching words are remembered until the vocabulary changes
+_MATCH_CACHE_SIZE = 1024
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into lowercase word tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of non-empty tokens
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+class WordIndex:
+    """
+    Inverted index mapping whole words to the ids of entries containing them.
+
+    Looking up a token returns the entries having a word that *contains* the
+    token, not only the word itself. Only distinct words are stored, each with
+    one set of ids; a lookup finds the words containing the token with a
+    single scan over the vocabulary and unions their ids. The vocabulary scan
+    is rebuilt lazily, and only when a word is added or dropped.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._postings: dict[str, set[int]] = {}
+        # Built on first lookup after the vocabulary changes
+        self._words: list[str] = []
+        self._vocabulary: Haystack | None = None
+        self._matches: dict[str, list[str]] = {}
+
+    def insert(self, words: Iterable[str], entry_id: int) -> None:
+        """
+        Index an entry under the given words.
+
+        Args:
+            words: Lowercase words the entry contains
+            entry_id: Integer id of the entry
+        """
+        postings = self._postings
+        for word in words:
+            ids = postings.get(word)
+            if ids is None:
+                ids = postings[word] = set()
+                self._vocabulary_changed()
+            ids.add(entry_id)
+
+    def remove(self, words: Iterable[str], entry_id: int) -> None:
+        """
+        Remove an entry from the given words.
+
+        Args:
+            words: Words the entry was inserted with
+            entry_id: Integer id of the entry
+        """
+        postings = self._postings
+        for word in words:
+            ids = postings.get(word)
+            if ids is None:
+                continue
+            ids.discard(entry_id)
+            if not ids:
+                del postings[word]
+                self._vocabulary_changed()
+
+    def lookup(self, token: str) -> set[int]:
+        """
+        Find entries with a word containing the token.
+
+        Args:
+            token: Lowercase token to look up
+
+        Returns:
+            Set of matching entry ids
+        """
+        postings = self._postings
+        ids: set[int] = set()
+        for word in self._words_containing(token):
+            ids |= postings[word]
+        return ids
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._postings.clear()
+        self._vocabulary_changed()
+
+    def __len__(self) -> int:
+        return len(self._postings)
+
+    def _words_containing(self, token: str) -> list[str]:
+        """Find the indexed words containing the token."""
+        words = self._matches.get(token)
+        if words is None:
+            if self._vocabulary is None:
+                self._words = list(self._postings)
+                self._vocabulary = Haystack(dict(enumerate(self._words)))
+            words = [self._words[i] for i in self._vocabulary.find_all(token)]
+            if len(self._matches) >= _MATCH_CACHE_SIZE:
+                self._matches.clear()
+            self._matches[token] = words
+        return words
+
+    def _vocabulary_changed(self) -> None:
+        """Drop the vocabulary scan and the words matched against it."""
+        if self._vocabulary is not None or self._matches:
+            self._vocabulary = None
+            self._words = []
+            self._matches.clear()
@@ -3,13 +3,17 @@
  * A clean, marimo-style code editor with custom execution backends
  */
 
+const HTML_ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;' };
+
+// Escape HTML special characters in a single pass over the text
+function escapeHtml(text) {
+  return text.replace(/[&<>]/g, (ch) => HTML_ESCAPES[ch]);
+}
+
 // Simple syntax highlighter for Python
 function highlightPython(code) {
   // Escape HTML first
-  let html = code
-    .replace(/&/g, '&amp;')
-    .replace(/</g, '&lt;')
-    .replace(/>/g, '&gt;');
+  let html = escapeHtml(code);
 
   // Comments (do first to avoid highlighting within comments)
   html = html.replace(/(#.*$)/gm, '<span class="syntax-comment">$1</span>');
@@ -41,10 +45,7 @@ function highlightPython(code) {
 }
 
 function highlightJavaScript(code) {
-  let html = code
-    .replace(/&/g, '&amp;')
-    .replace(/</g, '&lt;')
-    .replace(/>/g, '&gt;');
+  let html = escapeHtml(code);
 
   // Comments
   html = html.replace(/(\/\/.*$)/gm, '<span class="syntax-comment">$1</span>');
@@ -67,10 +68,7 @@ function highlightJavaScript(code) {
 }
 
 function highlightJSON(code) {
-  let html = code
-    .replace(/&/g, '&amp;')
-    .replace(/</g, '&lt;')
-    .replace(/>/g, '&gt;');
+  let html = escapeHtml(code);
 
   // Strings (keys and values)
   html = html.replace(/"([^"]+)"(\s*):/g, '<span class="syntax-key">"$1"</span>$2:');
@@ -95,7 +93,7 @@ function highlightCode(code, language) {
     return highlightJSON(code);
   }
   // Default: just escape HTML
-  return code.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+  return escapeHtml(code);
 }
 
 function render({ model, el }) {
@@ -1,7 +1,13 @@
 """Tests for CodebaseAgent widget."""
 
 import pytest
-from ontonaut import CodebaseAgent, IndexTag, clear_registry, index_type
+from ontonaut import (
+    CodebaseAgent,
+    IndexTag,
+    RegisteredType,
+    clear_registry,
+    index_type,
+)
 
 
 # Test fixtures
@@ -118,6 +124,14 @@ class TestCodebaseAgent:
         assert agent.placeholder == "Custom placeholder"
         assert agent.theme == "dark"
 
+    def test_replacing_client_redetects_its_shape(self):
+        """Test that assigning a new client switches how it is called."""
+        agent = CodebaseAgent(ai_client=MockAIClient("From mock"))
+        assert "".join(agent._stream_ai_response("q", "ctx")) == "From mock"
+
+        agent.ai_client = lambda query, context=None: "From callable"
+        assert "".join(agent._stream_ai_response("q", "ctx")) == "From callable"
+
     def test_search_codebase(self, sample_types):
         """Test codebase search functionality."""
         agent = CodebaseAgent()
@@ -142,6 +156,31 @@ class TestCodebaseAgent:
         assert "User" in html
         assert "agent-context-item" in html
         assert "User authentication model" in html
+        assert "User authentication model...</div>" not in html
+
+    def test_build_context_html_truncates_long_docstrings(self):
+        """Test that only docstrings over 200 characters are truncated."""
+
+        class Verbose:
+            __doc__ = "x" * 250
+
+        agent = CodebaseAgent()
+        html = agent._build_context_html([RegisteredType(Verbose)])
+
+        assert f">{'x' * 200}...</div>" in html
+
+    def test_build_context_html_reuses_rendered_items(self, sample_types):
+        """Test that rendering the same types again reuses cached item HTML."""
+        from ontonaut import get_registry
+        from ontonaut.codebase_agent import _context_item_html
+
+        agent = CodebaseAgent()
+        types = get_registry().get_all()
+        html = agent._build_context_html(types)
+
+        hits = _context_item_html.cache_info().hits
+        assert agent._build_context_html(types) == html
+        assert _context_item_html.cache_info().hits == hits + len(types)
 
     def test_build_context_html_empty(self):
         """Test building HTML with no types."""
@@ -261,6 +300,22 @@ class TestCodebaseAgent:
         assert "<h2>Header 2</h2>" in html
         assert "<h3>Header 3</h3>" in html
 
+    def test_incremental_markdown_matches_full_render(self):
+        """Test that streamed rendering equals rendering the whole text."""
+        from ontonaut.codebase_agent import _IncrementalMarkdown
+
+        agent = CodebaseAgent()
+        text = (
+            "# Title\nUse `create_user`\nand `split\nspan`.\n"
+            "```python\nuser = create_user()\n# not a header\n```\n"
+            "## Done\n```\nunclosed"
+        )
+        markdown = _IncrementalMarkdown(agent._markdown_to_html)
+        for i, char in enumerate(text):
+            markdown.feed(char)
+            assert markdown.html() == agent._markdown_to_html(text[: i + 1])
+        assert markdown.text == text
+
     def test_ask_method(self):
         """Test programmatic ask method."""
         from ontonaut import get_registry
@@ -286,6 +341,141 @@ class TestCodebaseAgent:
         assert len(agent.context) > 0
         assert "User" in agent.context
 
+    def test_ask_reuses_cached_response(self, sample_types):
+        """Test that repeated questions skip the AI client until types change."""
+        calls = []
+
+        def client(query, context=None):
+            calls.append(query)
+            # Without context this is the keyword extraction call
+            return "Answer" if context is not None else "user, authenticate"
+
+        agent = CodebaseAgent(ai_client=client)
+        agent.ask("How do I authenticate?")
+        assert len(calls) == 2
+
+        agent.ask("How do I authenticate?")
+        assert len(calls) == 2
+        assert agent.response == "Answer"
+        assert "User" in agent.context
+
+        @index_type()
+        class Session:
+            """Login session."""
+
+        # Only the answer is regenerated; the keywords are remembered
+        agent.ask("How do I authenticate?")
+        assert len(calls) == 3
+
+    def test_ask_does_not_cache_answer_failing_mid_stream(self, sample_types):
+        """Test that an answer cut short by a client error is asked again."""
+        calls = []
+
+        def client(query, context=None):
+            if context is None:
+                return "user"
+            calls.append(query)
+            return broken_stream()
+
+        def broken_stream():
+            yield "Partial answer "
+            raise ConnectionError("connection reset")
+
+        agent = CodebaseAgent(ai_client=client)
+        agent.ask("How do I authenticate?")
+        assert agent.response.startswith("Partial answer ")
+        assert "connection reset" in agent.response
+
+        agent.ask("How do I authenticate?")
+        assert len(calls) == 2
+        assert not agent._response_cache
+
+    def test_replacing_client_drops_cached_answers(self, sample_types):
+        """Test that a new client answers a question the old one answered."""
+
+        def client_a(query, context=None):
+            return "A-answer" if context is not None else "user"
+
+        def client_b(query, context=None):
+            return "B-answer" if context is not None else "user"
+
+        agent = CodebaseAgent(ai_client=client_a)
+        agent.ask("How do I authenticate?")
+        assert agent.response == "A-answer"
+
+        agent.ai_client = client_b
+        agent.ask("How do I authenticate?")
+        assert agent.response == "B-answer"
+
+    def test_replacing_client_drops_cached_keywords(self):
+        """Test that a new client extracts keywords the old one extracted."""
+        agent = CodebaseAgent(ai_client=lambda prompt: "alpha")
+        assert agent._extract_keywords_with_ai("question") == ["alpha"]
+
+        agent.ai_client = lambda prompt: "beta"
+        assert agent._extract_keywords_with_ai("question") == ["beta"]
+
+    def test_streamed_response_updates_are_throttled(self, sample_types):
+        """Test that fast streams update the response trait only occasionally."""
+
+        def client(query, context=None):
+            if context is None:
+                return "user"
+            return (f"word{i} " for i in range(500))
+
+        agent = CodebaseAgent(ai_client=client)
+        updates = []
+        agent.observe(lambda change: updates.append(change["new"]), names="response")
+
+        agent.ask("Tell me about users")
+
+        assert agent.response.endswith("word499 ")
+        assert len(updates) < 100
+
+    def test_frontend_question_answered_in_background(self, sample_types):
+        """Test that frontend questions are processed on a worker thread."""
+        import threading
+
+        threads = []
+
+        def client(query, context=None):
+            threads.append(threading.current_thread())
+            return "Answer" if context is not None else "user"
+
+        agent = CodebaseAgent(ai_client=client)
+        agent._handle_message(agent, {"type": "ask", "query": "Users?"}, [])
+        agent._pending_question.result(timeout=5)
+
+        assert agent.response == "Answer"
+        assert threads and threading.current_thread() not in threads
+        assert not agent._is_processing
+        assert agent.done == 1
+
+    def test_frontend_question_while_busy_is_acknowledged(self, sample_types):
+        """Test that a question sent while answering still releases the UI."""
+        import threading
+
+        release = threading.Event()
+        queries = []
+
+        def client(query, context=None):
+            queries.append(query)
+            release.wait(timeout=5)
+            return "Answer" if context is not None else "user"
+
+        agent = CodebaseAgent(ai_client=client)
+        agent._handle_message(agent, {"type": "ask", "query": "Users?"}, [])
+        first = agent._pending_question
+
+        agent._handle_message(agent, {"type": "ask", "query": "Orders?"}, [])
+        assert agent.done == 1
+        assert agent._pending_question is first
+
+        release.set()
+        first.result(timeout=5)
+        assert agent.done == 2
+        assert not any("Orders?" in query for query in queries)
+
     def test_process_question_error_handling(self):
         """Test error handling in question processing."""
 
@@ -508,3 +698,107 @@ class TestCodebaseAgentSmartSearch:
         # Score with irrelevant keyword
         score_low = agent._calculate_relevance_score(user_type, ["xyz123"])
         assert score_low == 0  # Should have zero score
+
+    def test_scoring_index_matches_relevance_score(self, sample_types):
+        """Test that indexed scores equal the per-type relevance score."""
+        from ontonaut import get_registry
+
+        agent = CodebaseAgent(ai_client=MockAIClient())
+        registry = get_registry()
+        keywords = ["user", "authenticate", "database", "user authentication", "Id"]
+
+        index = agent._get_scoring_index(registry)
+        scores = index.score(keywords)
+        for i, typ in enumerate(index.types):
+            expected = agent._calculate_relevance_score(typ, keywords)
+            assert scores.get(i, 0) == expected
+
+        # The index is reused until the registry changes
+        assert agent._get_scoring_index(registry) is index
+
+        @index_type(tags=[TestTags.API])
+        class Invoice:
+            """Billing document."""
+
+        # Changes are applied to the same index rather than rebuilding it
+        synced = agent._get_scoring_index(registry)
+        assert synced is index
+        assert any(t.name == "Invoice" for t in synced.types)
+
+    def test_scoring_index_follows_registry_changes(self, sample_types):
+        """Test that syncing after adds, replacements and removals scores right."""
+        from ontonaut import get_registry
+
+        agent = CodebaseAgent(ai_client=MockAIClient())
+        registry = get_registry()
+        keywords = ["user", "billing", "document", "invoice"]
+        index = agent._get_scoring_index(registry)
+
+        @index_type(tags=[TestTags.API])
+        class Invoice:
+            """Billing document."""
+
+        agent._get_scoring_index(registry)
+
+        @index_type(instructions="User invoices")
+        class Invoice:  # noqa: F811
+            """Replacement under the same path."""
+
+        user_type = next(t for t in registry.get_all() if t.name == "User")
+        registry.unregister(user_type.cls)
+
+        assert agent._get_scoring_index(registry) is index
+        scores = index.score(keywords)
+        assert [t.name for t in index.types] == [t.name for t in registry.get_all()]
+        for i, typ in enumerate(index.types):
+            assert scores.get(i, 0) == agent._calculate_relevance_score(typ, keywords)
+        assert len(index._slots) == len(registry)
+
+    @pytest.mark.slow
+    def test_scoring_index_registry_churn_benchmark(self):
+        """Test that registering one type does not re-index the whole registry."""
+        import time
+
+        from ontonaut import get_registry, register_type
+
+        registry = get_registry()
+        for i in range(300):
+            methods = {
+                f"handle_{word}_{i}": lambda self: None
+                for word in ("request", "session", "payload", "stream")
+            }
+            register_type(
+                type(f"Service{i}", (), {"__doc__": f"Service {i}.", **methods})
+            )
+
+        agent = CodebaseAgent(ai_client=MockAIClient())
+        start = time.perf_counter()
+        index = agent._get_scoring_index(registry)
+        build = time.perf_counter() - start
+        postings = len(index._texts)
+
+        start = time.perf_counter()
+        for i in range(30):
+            register_type(type(f"Extra{i}", (), {"__doc__": "Extra request."}))
+            assert agent._get_scoring_index(registry) is index
+            assert index.types[index.top([f"extra{i}"])[0]].name == f"Extra{i}"
+        churn = time.perf_counter() - start
+
+        # Only the new types' fields were indexed (name, module, docstring),
+        # and 30 syncs cost far less than the 30 full rebuilds they replace
+        assert len(index._texts) == postings + 30 * 3
+        assert churn < build * 10
+
+    def test_scoring_index_reuses_rankings(self, sample_types):
+        """Test that keyword sets in any order or case share one ranking."""
+        from ontonaut import get_registry
+
+        agent = CodebaseAgent(ai_client=MockAIClient())
+        index = agent._get_scoring_index(get_registry())
+
+        first = index.top(["user", "database"])
+        assert first
+        assert [index.types[i].name for i in first][0] == "User"
+        assert index.top(["Database", "USER"]) == first
+        assert len(index._top_cache) == 1
+        assert index.top(["database", "user"], limit=1) == first[:1]
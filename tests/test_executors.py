@@ -125,6 +125,13 @@ class TestCalculatorExecutor:
 
         assert result == 30
 
+    def test_variables_with_overlapping_names(self) -> None:
+        """Test that only whole variable names are substituted."""
+        executor = CalculatorExecutor()
+        code = "rate = 2\nrate2 = rate * 3\nrate2 + rate"
+
+        assert executor.execute(code) == 8
+
     def test_variable_persistence(self) -> None:
         """Test that variables persist across executions."""
         executor = CalculatorExecutor()
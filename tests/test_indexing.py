@@ -1,5 +1,9 @@
 """Tests for the indexing system."""
 
+import functools
+import json
+import sys
+
 import pytest
 from ontonaut import (
     IndexTag,
@@ -9,6 +13,9 @@ from ontonaut import (
     index_type,
     search_registry,
 )
+from ontonaut.indexing.fuzzy import BKTree, identifier_words, levenshtein
+from ontonaut.indexing.haystack import Haystack
+from ontonaut.indexing.words import WordIndex, tokenize
 
 
 # Test fixtures
@@ -25,6 +32,7 @@ class SampleClass:
     """A sample class for testing."""
 
     class_attr = 42
+    typed_attr: int = 7
 
     def __init__(self, value: int):
         self.value = value
@@ -61,9 +69,22 @@ class SampleClass:
         pass
 
 
-@pytest.fixture(autouse=True)
+class DerivedSample(SampleClass):
+    """A subclass overriding a documented method without a docstring."""
+
+    def public_method(self, x: int) -> int:
+        return x
+
+    def described(self) -> None:
+        pass
+
+    # Assigned rather than written inline, where formatters strip the indent
+    described.__doc__ = "   Indented single line."
+
+
+@pytest.fixture
 def clean_registry():
-    """Clear registry before and after each test."""
+    """Clear registry before and after each test that uses it."""
     clear_registry()
     yield
     clear_registry()
@@ -84,17 +105,47 @@ class TestIndexTag:
     def test_tag_from_string(self):
         """Test creating tag from string."""
         tag = TestTags.from_string("database")
-        assert tag == TestTags.DATABASE
+        assert tag is TestTags.DATABASE
+
+        with pytest.raises(ValueError):
+            TestTags.from_string("missing")
 
     def test_tag_equality_with_string(self):
         """Test tag equality with strings."""
         assert TestTags.DATABASE == "database"
+        assert TestTags.DATABASE != "api"
+        assert TestTags.DATABASE != 1
+        assert hash(TestTags.DATABASE) == hash("database")
+        assert {"database": 1}[TestTags.DATABASE] == 1
+
+    def test_tag_values_interned(self):
+        """Test that tag values built at runtime are interned."""
+
+        class RuntimeTags(IndexTag):
+            DYNAMIC = "".join(["dyn", "amic"])
+
+        assert RuntimeTags.DYNAMIC.value is sys.intern("dynamic")
+        assert RuntimeTags("dynamic") is RuntimeTags.DYNAMIC
+
+    def test_tag_non_string_values(self):
+        """Test that non-string member values are accepted as their text."""
+        from enum import auto
+
+        class NumberedTags(IndexTag):
+            FIRST = auto()
+            SECOND = 2
+
+        assert NumberedTags.FIRST.value == "1"
+        assert NumberedTags.SECOND == "2"
+        assert str(NumberedTags.SECOND) == "2"
+        assert NumberedTags.from_string("2") is NumberedTags.SECOND
 
     def test_tag_repr(self):
         """Test tag representation."""
         assert "TestTags.DATABASE" in repr(TestTags.DATABASE)
 
 
+@pytest.mark.usefixtures("clean_registry")
 class TestRegisteredType:
     """Test RegisteredType functionality."""
 
@@ -120,6 +171,168 @@ class TestRegisteredType:
         registered = RegisteredType(SampleClass)
         assert "A sample class for testing" in registered.docstring
 
+    def test_member_docstrings_cleaned_and_inherited(self):
+        """Test docstring cleanup and inheritance for overridden methods."""
+
+        methods = RegisteredType(DerivedSample).methods
+        assert methods["public_method"].docstring.startswith("A public method.")
+        assert methods["described"].docstring == "Indented single line."
+
+    def test_from_path(self):
+        """Test rebuilding a registered type from its path."""
+        registered = RegisteredType.from_path("collections.OrderedDict")
+        assert registered.name == "OrderedDict"
+
+        with pytest.raises(ImportError):
+            RegisteredType.from_path("ontonaut_missing_module.Missing")
+
+    def test_uses_slots(self):
+        """Test that instances carry no per-instance dict."""
+        registered = RegisteredType(SampleClass)
+        assert not hasattr(registered, "__dict__")
+
+    def test_method_info_access(self):
+        """Test that method info reads as attributes and as a mapping."""
+        info = RegisteredType(SampleClass).methods["static_method"]
+
+        assert info.is_staticmethod
+        assert info["signature"] == info.signature == "() -> str"
+        assert info.get("missing", "default") == "default"
+        assert (
+            dict(info)
+            == info._asdict()
+            == {
+                "docstring": "A static method.",
+                "signature": "() -> str",
+                "is_classmethod": False,
+                "is_staticmethod": True,
+                "is_property": False,
+            }
+        )
+        assert not hasattr(info, "__dict__")
+
+    def test_metadata_extracted_lazily(self):
+        """Test that members are only introspected when first accessed."""
+        registered = RegisteredType(SampleClass)
+        assert registered._metadata is None
+
+        assert "public_method" in registered.methods
+        assert registered._metadata is not None
+
+    def test_method_extraction_skips_failing_descriptor(self):
+        """Test that a descriptor failing on class access is not a method."""
+
+        class Exploding:
+            def __get__(self, obj, owner):
+                raise RuntimeError("descriptor evaluated")
+
+        class WithDescriptor:
+            trap = Exploding()
+
+            def run(self) -> None:
+                """Run it."""
+
+        from ontonaut.indexing.metadata import extract_public_methods
+
+        assert list(extract_public_methods(WithDescriptor)) == ["run"]
+
+    def test_method_extraction_includes_partialmethod(self):
+        """Test that callable descriptors like partialmethod count as methods."""
+
+        class WithPartial:
+            def scale(self, x: int, factor: int) -> int:
+                """Scale a value."""
+                return x * factor
+
+            double = functools.partialmethod(scale, factor=2)
+
+        from ontonaut.indexing.metadata import extract_type_metadata
+
+        metadata = extract_type_metadata(WithPartial)
+        assert metadata["methods"]["double"].signature == (
+            "(self, x: int, *, factor: int = 2) -> int"
+        )
+        assert "double" not in metadata["attributes"]
+
+    def test_type_metadata_matches_member_extractors(self):
+        """Test that the single-pass extraction agrees with each extractor."""
+        from ontonaut.indexing.metadata import (
+            extract_class_attributes,
+            extract_public_methods,
+            extract_public_properties,
+            extract_type_metadata,
+        )
+
+        metadata = extract_type_metadata(TestTags)
+        assert metadata["methods"] == extract_public_methods(TestTags)
+        assert metadata["properties"] == extract_public_properties(TestTags)
+        assert metadata["attributes"] == extract_class_attributes(TestTags)
+        assert "DATABASE" in metadata["attributes"]
+
+    def test_type_metadata_cached_per_class(self):
+        """Test that re-registering a class reuses its extracted metadata."""
+        from ontonaut.indexing.metadata import extract_type_metadata
+
+        first = extract_type_metadata(SampleClass)
+        second = extract_type_metadata(SampleClass)
+
+        assert first == second
+        assert first is not second
+        assert first["methods"] is not second["methods"]
+        assert first["methods"]["public_method"] is second["methods"]["public_method"]
+
+    def test_type_metadata_cache_not_shared_mutably(self):
+        """Test that changing returned metadata leaves the cache intact."""
+        from ontonaut.indexing.metadata import extract_type_metadata
+
+        first = RegisteredType(SampleClass)
+        first.methods.pop("public_method")
+        first.attributes["class_attr"]["value"] = "0"
+        with pytest.raises(AttributeError):
+            first.methods["static_method"].docstring = "changed"
+
+        second = RegisteredType(SampleClass)
+        assert "public_method" in second.methods
+        assert second.attributes["class_attr"]["value"] == "42"
+        cached = extract_type_metadata(SampleClass)
+        assert cached["methods"]["static_method"].docstring == "A static method."
+
+    def test_clear_cache_reintrospects_changed_class(self):
+        """Test that clearing the cache picks up methods added at runtime."""
+        from ontonaut.indexing.metadata import clear_cache
+
+        class Growing:
+            def first(self) -> None:
+                """First method."""
+
+        assert list(RegisteredType(Growing).methods) == ["first"]
+
+        def second(self) -> None:
+            """Second method."""
+
+        Growing.second = second
+        assert list(RegisteredType(Growing).methods) == ["first"]
+
+        clear_cache()
+        assert list(RegisteredType(Growing).methods) == ["first", "second"]
+
+    def test_inherited_signature_cached(self):
+        """Test that inherited methods reuse the rendered signature."""
+
+        class SampleChild(SampleClass):
+            """Subclass inheriting public_method."""
+
+        parent = RegisteredType(SampleClass).methods["public_method"]
+        child = RegisteredType(SampleChild).methods["public_method"]
+
+        assert parent["signature"] == "(self, x: int) -> int"
+        assert child["signature"] is parent["signature"]
+
+        parent_cm = RegisteredType(SampleClass).methods["class_method"]
+        child_cm = RegisteredType(SampleChild).methods["class_method"]
+        assert parent_cm["signature"] == "() -> str"
+        assert child_cm["signature"] is parent_cm["signature"]
+
     def test_method_extraction(self):
         """Test method extraction."""
         registered = RegisteredType(SampleClass)
@@ -148,6 +361,11 @@ class TestRegisteredType:
         assert "computed_property" in properties
         assert "A computed property" in properties["computed_property"]["docstring"]
 
+        info = properties["computed_property"]
+        assert info.docstring == "A computed property."
+        assert not info.has_setter
+        assert not hasattr(info, "__dict__")
+
     def test_attribute_extraction(self):
         """Test class attribute extraction."""
         registered = RegisteredType(SampleClass)
@@ -168,6 +386,9 @@ class TestRegisteredType:
 
         assert registered.has_all_tags([TestTags.DATABASE, TestTags.API])
         assert not registered.has_all_tags([TestTags.DATABASE, TestTags.UTIL])
+        assert registered.has_all_tags(["api", TestTags.DATABASE])
+        assert registered.has_all_tags([])
+        assert not registered.has_any_tag([])
 
     def test_search_methods(self):
         """Test method searching."""
@@ -175,6 +396,10 @@ class TestRegisteredType:
         results = registered.search_methods("public")
 
         assert "public_method" in results
+        assert "class_method" in registered.search_methods("CLASS")
+        assert registered.search_methods("input value") == {
+            "public_method": registered.methods["public_method"]
+        }
 
     def test_search_properties(self):
         """Test property searching."""
@@ -183,6 +408,56 @@ class TestRegisteredType:
 
         assert "computed_property" in results
 
+    def test_full_text(self):
+        """Test that full text covers members and tags, lowercased."""
+        registered = RegisteredType(SampleClass, tags=[TestTags.DATABASE])
+        text = registered.full_text
+
+        assert "sampleclass" in text
+        assert "public_method" in text
+        assert "a computed property" in text
+        assert "database" in text
+        assert "_private_method" not in text
+
+    def test_lowercase_fields(self):
+        """Test that searchable fields are lowercased once and tagged by kind."""
+        registered = RegisteredType(SampleClass, tags=[TestTags.DATABASE])
+        fields = registered.lowercase_fields
+
+        assert ("name", "sampleclass") in fields
+        assert ("tag", "database") in fields
+        assert ("method", "public_method") in fields
+        assert ("property_doc", "a computed property.") in fields
+        assert registered.lowercase_fields is fields
+
+    def test_context_snippet(self):
+        """Test that the AI context snippet is formatted once and reused."""
+        registered = RegisteredType(
+            SampleClass, tags=[TestTags.DATABASE], instructions="Use carefully"
+        )
+        snippet = registered.context_snippet
+
+        assert snippet.startswith(f"## {registered.cls_path}\n")
+        assert "**Tags:** database" in snippet
+        assert "**Notes:** Use carefully" in snippet
+        assert "- `public_method(self, x: int) -> int`" in snippet
+        assert registered.context_snippet is snippet
+
+    def test_tag_names(self):
+        """Test that tag string values are kept alongside the tags."""
+        registered = RegisteredType(SampleClass, tags=[TestTags.DATABASE, "custom"])
+        assert registered.tag_names == ("database", "custom")
+        assert repr(registered).endswith("tags=[database, custom])")
+
+    def test_tags_frozen(self):
+        """Test that tags are copied into a tuple at construction."""
+        tags = [TestTags.DATABASE]
+        registered = RegisteredType(SampleClass, tags=tags)
+        tags.append(TestTags.API)
+
+        assert registered.tags == (TestTags.DATABASE,)
+        assert not registered.has_tag(TestTags.API)
+
     def test_to_dict(self):
         """Test dictionary conversion."""
         registered = RegisteredType(SampleClass, tags=[TestTags.DATABASE])
@@ -192,8 +467,163 @@ class TestRegisteredType:
         assert "database" in data["tags"]
         assert "cls_path" in data
         assert "metadata" in data
+        assert data["metadata"]["tags"] == ("database",)
+
+    def test_to_dict_methods_serializable(self):
+        """Test that method metadata in to_dict() survives a JSON round trip."""
+        methods = RegisteredType(SampleClass).to_dict()["metadata"]["methods"]
+
+        assert json.loads(json.dumps(methods)) == methods
+        assert type(methods["public_method"]) is dict
+        assert methods["public_method"]["signature"] == "(self, x: int) -> int"
+
+    def test_to_dict_properties_serializable(self):
+        """Test that property metadata in to_dict() survives a JSON round trip."""
+        data = RegisteredType(SampleClass).to_dict()
+        properties = data["metadata"]["properties"]
+
+        assert json.loads(json.dumps(properties)) == properties
+        assert properties["computed_property"] == {
+            "docstring": "A computed property.",
+            "has_setter": False,
+            "has_deleter": False,
+        }
+        json.dumps(data)
+
+    def test_to_dict_attribute_annotations_serializable(self):
+        """Test that attribute annotations in to_dict() are formatted as text."""
+        registered = RegisteredType(SampleClass)
+        data = registered.to_dict()
 
+        assert data["metadata"]["attributes"]["typed_attr"] == {
+            "value": "7",
+            "type": "int",
+        }
+        assert data["metadata"]["attributes"]["class_attr"]["type"] is None
+        assert registered.attributes["typed_attr"]["type"] is int
+        assert json.loads(json.dumps(data))["metadata"] == data["metadata"] | {
+            "tags": [],
+        }
 
+    def test_to_dict_copy_is_independent(self):
+        """Test that changing to_dict() output leaves the registered type intact."""
+
+        class Child(SampleClass):
+            pass
+
+        registered = RegisteredType(Child)
+        data = registered.to_dict()
+        bases = list(registered.bases)
+        assert json.loads(json.dumps(data))["metadata"]["bases"] == bases
+
+        data["metadata"]["attributes"]["class_attr"]["value"] = "0"
+        data["metadata"]["bases"].append("Other")
+        data["metadata"]["methods"].clear()
+
+        assert registered.attributes["class_attr"]["value"] == "42"
+        assert registered.bases == bases
+        assert "public_method" in registered.methods
+
+    def test_metadata_view_shared_and_read_only(self):
+        """Test that the metadata mapping is built once and cannot be changed."""
+        registered = RegisteredType(SampleClass, instructions="notes")
+
+        metadata = registered.metadata
+        assert metadata is registered.metadata
+        assert metadata["instructions"] == "notes"
+        with pytest.raises(TypeError):
+            metadata["instructions"] = "changed"
+
+
+class TestWordIndex:
+    """Test the word index used by registry search."""
+
+    def test_lookup_substring(self):
+        """Test that lookups match anywhere inside a word."""
+        index = WordIndex()
+        index.insert(["authenticate"], 1)
+        index.insert(["user"], 2)
+
+        assert index.lookup("auth") == {1}
+        assert index.lookup("then") == {1}
+        assert index.lookup("ser") == {2}
+        assert index.lookup("xyz") == set()
+
+    def test_remove(self):
+        """Test removing an entry."""
+        index = WordIndex()
+        index.insert(["user", "users"], 1)
+        index.insert(["user"], 2)
+        index.remove(["user", "users"], 1)
+
+        assert index.lookup("user") == {2}
+        assert index.lookup("users") == set()
+        assert len(index) == 1
+
+    def test_lookup_after_vocabulary_change(self):
+        """Test that lookups see words added and dropped after a lookup."""
+        index = WordIndex()
+        index.insert(["username"], 1)
+        assert index.lookup("name") == {1}
+
+        index.insert(["rename"], 2)
+        assert index.lookup("name") == {1, 2}
+
+        index.remove(["username"], 1)
+        assert index.lookup("name") == {2}
+        assert index.lookup("user") == set()
+
+    def test_lookup_long_token(self):
+        """Test that tokens of any length are matched exactly."""
+        index = WordIndex()
+        word = "a" * 40 + "b"
+        index.insert([word], 1)
+        index.insert(["a" * 40 + "c"], 2)
+
+        assert index.lookup(word) == {1}
+        assert index.lookup("a" * 40) == {1, 2}
+
+    def test_haystack_find_all(self):
+        """Test bulk substring scanning with one hit per entry."""
+        haystack = Haystack({3: "user user", 5: "session", 8: "username"})
+
+        assert haystack.find_all("user") == {3, 8}
+        assert haystack.find_all("ion") == {5}
+        assert haystack.find_all("usersession") == set()
+
+    def test_tokenize(self):
+        """Test tokenization of text."""
+        assert tokenize("User model, for AUTH_tokens!") == [
+            "user",
+            "model",
+            "for",
+            "auth_tokens",
+        ]
+
+    def test_levenshtein(self):
+        """Test edit distances."""
+        assert levenshtein("kitten", "sitting") == 3
+        assert levenshtein("", "abc") == 3
+        assert levenshtein("same", "same") == 0
+
+    def test_bktree_search(self):
+        """Test approximate lookups within an edit radius."""
+        tree = BKTree()
+        for entry_id, term in enumerate(["authenticate", "user", "users", "session"]):
+            tree.add(term, entry_id)
+
+        assert tree.search("authenitcate", 2) == {0}
+        assert tree.search("usr", 1) == {1}
+        assert tree.search("usr", 2) == {1, 2}
+        assert tree.search("xyz", 1) == set()
+
+    def test_identifier_words(self):
+        """Test splitting identifiers into words."""
+        assert identifier_words("UserService") == {"userservice", "user", "service"}
+        assert identifier_words("create_user") == {"create_user", "create", "user"}
+
+
+@pytest.mark.usefixtures("clean_registry")
 class TestTypeRegistry:
     """Test TypeRegistry functionality."""
 
@@ -223,6 +653,22 @@ class TestTypeRegistry:
         assert found is not None
         assert found.cls == SampleClass
 
+    def test_get_redefined_class(self):
+        """Test lookups after a class is redefined under the same path."""
+        registry = get_registry()
+        old = type("Redefined", (), {})
+        new = type("Redefined", (), {})
+        registry.register(old)
+        registered = registry.register(new)
+
+        assert registry.get(new) is registered
+        assert registry.get(old) is registered
+        assert len(registry) == 1
+
+        registry.unregister(old)
+        assert registry.get(new) is None
+        assert len(registry) == 0
+
     def test_unregister_type(self):
         """Test unregistering a type."""
         registry = get_registry()
@@ -232,6 +678,23 @@ class TestTypeRegistry:
         registry.unregister(SampleClass)
         assert len(registry) == 0
 
+    def test_unregister_after_qualname_change(self):
+        """Test unregistering a class re-registered under a new path."""
+        registry = get_registry()
+        cls = type("Renamed", (), {})
+        old_path = registry.register(cls).cls_path
+        cls.__qualname__ = "RenamedAgain"
+        registered = registry.register(cls)
+
+        registry.unregister(old_path)
+        assert registry.get(cls) is registered
+        assert len(registry) == 1
+
+        registry.unregister(cls)
+        assert registry.get(cls) is None
+        assert len(registry) == 0
+        assert registry.search(query="RenamedAgain") == []
+
     def test_get_all(self):
         """Test getting all registered types."""
         registry = get_registry()
@@ -302,7 +765,182 @@ class TestTypeRegistry:
         )
         assert len(results) == 0
 
+    def test_search_tags_across_tag_classes(self):
+        """Test that tags match by value, whichever enum they come from."""
+
+        class OtherTags(IndexTag):
+            DATABASE = "database"
+            CACHE = "cache"
+
+        registry = get_registry()
+        registry.register(SampleClass, tags=[TestTags.DATABASE, TestTags.API])
+
+        assert len(registry.search(tags=[OtherTags.DATABASE])) == 1
+        assert (
+            len(registry.search(tags=["database", "api"], require_all_tags=True)) == 1
+        )
+        assert len(registry.search(tags=[OtherTags.CACHE])) == 0
+        assert (
+            len(registry.search(tags=["database", "unknown"], require_all_tags=True))
+            == 0
+        )
+
+    def test_search_unknown_tags_allocate_no_bits(self):
+        """Test that query tags never registered leave the tag bits alone."""
+        from ontonaut.indexing import tags as tags_module
+
+        registry = get_registry()
+        registry.register(SampleClass, tags=[TestTags.DATABASE])
+        bits = dict(tags_module._tag_bits)
+
+        for i in range(50):
+            registry.search(query="sample", tags=[f"unknown-{i}"])
+        assert tags_module._tag_bits == bits
+
+        any_tag = registry.search(query="sample", tags=["database", "unknown-0"])
+        assert [r.name for r in any_tag] == ["SampleClass"]
+        assert registry.search(query="sample", tags=["unknown-0"]) == []
+        assert (
+            registry.search(
+                query="sample", tags=["database", "unknown-0"], require_all_tags=True
+            )
+            == []
+        )
+        assert tags_module._tag_bits == bits
+
+    def test_search_tags_follow_registration_changes(self):
+        """Test tag-only searches after re-registering and unregistering."""
+        registry = get_registry()
+        other = type("Other", (), {})
+        registry.register(SampleClass, tags=[TestTags.DATABASE])
+        registry.register(other, tags=[TestTags.DATABASE, TestTags.API])
+
+        results = registry.search(tags=[TestTags.DATABASE])
+        assert [r.name for r in results] == ["SampleClass", "Other"]
+
+        registry.register(SampleClass, tags=[TestTags.API])
+        assert [r.name for r in registry.search(tags=[TestTags.DATABASE])] == ["Other"]
+        results = registry.search(tags=[TestTags.API, TestTags.UTIL])
+        assert [r.name for r in results] == ["SampleClass", "Other"]
+
+        registry.unregister(other)
+        assert registry.search(tags=[TestTags.DATABASE]) == []
+
+    def test_search_matches_inside_words(self):
+        """Test query matching inside words and across word boundaries."""
+        registry = get_registry()
+        registry.register(SampleClass, instructions="handles authentication tokens")
+
+        assert len(registry.search(query="thenticat")) == 1
+        assert len(registry.search(query="authentication tok")) == 1
+        assert len(registry.search(query="tokens authentication")) == 0
+
+    def test_search_results_invalidated_on_register(self):
+        """Test that cached search results reflect later registrations."""
+        registry = get_registry()
+        registry.register(SampleClass, instructions="sample")
+        version = registry.version
+
+        results = registry.search(query="sample")
+        assert len(results) == 1
+        results.clear()
+        assert len(registry.search(query="sample")) == 1
+
+        class OtherSample:
+            """Another sample class."""
+
+        registry.register(OtherSample)
+        assert registry.version > version
+        assert len(registry.search(query="sample")) == 2
+
+    def test_search_large_registry(self):
+        """Test query matching when the registry is scanned in bulk."""
+        registry = get_registry()
+        for i in range(300):
+            cls = type(f"Generated{i}", (), {"__doc__": f"Generated type number {i}"})
+            registry.register(cls)
+
+        assert len(registry.search(query="generated")) == 300
+        assert len(registry.search(query="number 29")) == 11
+        assert registry.search(query="number 299")[0].name == "Generated299"
+
+    def test_search_multiple_terms(self):
+        """Test that every term of a list query must match, in any order."""
+        registry = get_registry()
+        for i in range(300):
+            cls = type(f"Generated{i}", (), {"__doc__": f"Generated type number {i}"})
+            registry.register(cls, instructions="even" if i % 2 == 0 else "odd")
+
+        assert len(registry.search(query=["number 29", "odd"])) == 6
+        assert len(registry.search(query=["ODD", "generated"])) == 150
+        assert registry.search(query=["even", "number 299"]) == []
+        assert len(registry.search(query=[])) == 300
+
+    def test_search_after_unregister(self):
+        """Test that unregistered types no longer match queries."""
+        registry = get_registry()
+        registry.register(SampleClass, instructions="sample")
+        registry.unregister(SampleClass)
+
+        assert registry.search(query="sample") == []
+
+    def test_tag_counts(self):
+        """Test that tag counts follow registration and removal."""
+        registry = get_registry()
+        registry.register(SampleClass, tags=[TestTags.DATABASE, TestTags.API])
+        registry.register(type("Other", (), {}), tags=[TestTags.DATABASE, "api"])
+        assert registry.tag_counts() == {"database": 2, "api": 2}
+
+        registry.register(SampleClass, tags=[TestTags.UTIL])
+        assert registry.tag_counts() == {"database": 1, "api": 1, "util": 1}
+
+        registry.unregister(SampleClass)
+        assert registry.tag_counts() == {"database": 1, "api": 1}
+
+        registry.clear()
+        assert registry.tag_counts() == {}
+
+    def test_batch_registration(self):
+        """Test that a batch indexes its types once on exit."""
+        registry = get_registry()
+        version = registry.version
+
+        with registry.batch():
+            registry.register(SampleClass, instructions="sample")
+            for i in range(3):
+                registry.register(type(f"Batched{i}", (), {}))
+            assert registry._version == version
+            assert len(registry) == 4
+
+        assert registry.version == version + 1
+        assert len(registry.search(query="batched")) == 3
+
+    def test_batch_search_inside_block(self):
+        """Test that searching inside a batch sees pending types."""
+        registry = get_registry()
+
+        with registry.batch():
+            registry.register(SampleClass)
+            assert registry.search(query="sample")[0].cls is SampleClass
+            registry.unregister(SampleClass)
+            pending = registry.register(type("Pending", (), {}))
+            registry.unregister(pending.cls_path)
+
+        assert registry.search(query="sample") == []
+        assert registry.search(query="pending") == []
+
+    def test_search_fuzzy(self):
+        """Test that fuzzy search tolerates misspelled names."""
+        registry = get_registry()
+        registry.register(SampleClass)
+
+        assert registry.search(query="pubilc_method") == []
+        assert registry.search(query="pubilc_method", fuzzy=True)[0].cls is SampleClass
+        assert registry.search(query="smaple", fuzzy=True)[0].cls is SampleClass
+        assert registry.search(query="unrelated", fuzzy=True) == []
+
 
+@pytest.mark.usefixtures("clean_registry")
 class TestIndexTypeDecorator:
     """Test index_type decorator/function."""
 
@@ -351,6 +989,7 @@ class TestIndexTypeDecorator:
         assert TestClass in registry
 
 
+@pytest.mark.usefixtures("clean_registry")
 class TestGlobalFunctions:
     """Test global helper functions."""
 
@@ -374,6 +1013,7 @@ class TestGlobalFunctions:
         assert len(results) >= 0
 
 
+@pytest.mark.usefixtures("clean_registry")
 class TestThreadSafety:
     """Test thread safety of registry."""
 